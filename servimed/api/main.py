@@ -3,12 +3,18 @@ Esta API recebe requisições de scraping e pedidos, enviando-as para processame
 assíncrono via Celery workers com detecção automática do tipo de tarefa.
 """
 
-import uuid
+import asyncio
+import os
+import time
+from collections import OrderedDict
 from datetime import datetime
-from typing import Dict, Any, Union
+from typing import Annotated, Dict, Any, Optional, Tuple, Union
 
-from fastapi import FastAPI, HTTPException, BackgroundTasks
-from fastapi.responses import JSONResponse
+import orjson
+from pydantic import Discriminator, Tag, TypeAdapter, ValidationError
+from fastapi import Depends, FastAPI, HTTPException, BackgroundTasks, Request
+from fastapi.exceptions import RequestValidationError
+from fastapi.responses import ORJSONResponse, Response
 
 from models.scraping_task import (
     ScrapingTaskRequest,
@@ -19,6 +25,15 @@ from models.order import OrderRequest, OrderStatus
 from tasks.scraping_tasks import execute_scraping
 from tasks.order_tasks import execute_order
 from celery_app import celery_app
+from api.task_submitter import TaskSubmitter
+
+# Métricas Prometheus (opcional)
+try:
+    from prometheus_fastapi_instrumentator import Instrumentator
+
+    METRICS_AVAILABLE = True
+except ImportError:
+    METRICS_AVAILABLE = False
 
 
 # Configuração da API
@@ -26,17 +41,276 @@ app = FastAPI(
     title="Servimed Scraping & Orders API",
     description="API para gerenciamento de tarefas de scraping e pedidos assíncrono",
     version="2.0.0",
+    default_response_class=ORJSONResponse,
 )
 
+# Instrumentação: paths agrupados pelo template (task_id não vira label)
+if METRICS_AVAILABLE:
+    Instrumentator(
+        should_group_status_codes=True,
+        should_ignore_untemplated=True,
+        excluded_handlers=["/metrics", "/health"],
+    ).instrument(app).expose(app, include_in_schema=False)
+
+
+def _task_type_discriminator(value: Any) -> str:
+    """
+    Identifica o tipo da tarefa pelo campo 'task_type'.
+
+    Sem 'task_type', requisições com 'produtos' são tratadas como pedido
+    (compatibilidade com clientes antigos).
+    """
+    if isinstance(value, dict):
+        task_type = value.get("task_type")
+        if task_type:
+            return task_type
+        return "order" if "produtos" in value else "scraping"
+    return getattr(value, "task_type", "scraping")
+
+
+TaskRequest = Annotated[
+    Union[
+        Annotated[ScrapingTaskRequest, Tag("scraping")],
+        Annotated[OrderRequest, Tag("order")],
+    ],
+    Discriminator(_task_type_discriminator),
+]
+
+# Validação direta do JSON bruto no pydantic-core (sem json.loads intermediário)
+_task_request_adapter = TypeAdapter(TaskRequest)
+
+
+def _inline_schema_refs(schema: Any, defs: Dict[str, Any]) -> Any:
+    """Substitui referências '$defs' pelo schema correspondente."""
+    if isinstance(schema, dict):
+        ref = schema.get("$ref")
+        if ref and ref.startswith("#/$defs/"):
+            return _inline_schema_refs(defs[ref.rsplit("/", 1)[-1]], defs)
+        return {k: _inline_schema_refs(v, defs) for k, v in schema.items()}
+    if isinstance(schema, list):
+        return [_inline_schema_refs(item, defs) for item in schema]
+    return schema
+
+
+def _task_request_openapi() -> Dict[str, Any]:
+    """Schema OpenAPI do corpo de POST /scraping."""
+    schema = _task_request_adapter.json_schema()
+    defs = schema.pop("$defs", {})
+    return {
+        "requestBody": {
+            "required": True,
+            "content": {
+                "application/json": {"schema": _inline_schema_refs(schema, defs)}
+            },
+        }
+    }
+
+
+async def parse_task_request(request: Request) -> Union[ScrapingTaskRequest, OrderRequest]:
+    """Lê e valida o corpo da requisição em uma única passagem."""
+    try:
+        return _task_request_adapter.validate_json(await request.body())
+    except ValidationError as e:
+        raise RequestValidationError(
+            [{**error, "loc": ("body", *error["loc"])} for error in e.errors()]
+        )
+
+
+# Corpos pré-serializados dos endpoints estáticos
+_ROOT_BODY = orjson.dumps(
+    {
+        "message": "Servimed Scraping & Orders API - Fases 2 e 3",
+        "version": "2.0.0",
+        "endpoints": {
+            "create_task": "POST /scraping (Scraping ou Pedido)",
+            "check_status": "GET /scraping/{task_id}",
+            "health": "GET /health",
+        },
+        "supported_tasks": {
+            "scraping": "Extração de produtos (Fase 2)",
+            "order": "Processamento de pedidos (Fase 3)",
+        },
+    }
+)
+
+# /health: apenas o timestamp varia entre requisições
+_HEALTH_PREFIX = b'{"status":"healthy","timestamp":"'
+_HEALTH_SUFFIX = (
+    b'",'
+    + orjson.dumps(
+        {
+            "service": "Servimed Scraping & Orders API",
+            "phases": ["Fase 1: Scraping", "Fase 2: Filas", "Fase 3: Pedidos"],
+        }
+    )[1:]
+)
+
+# Cache em memória dos metadados de tarefas (evita consultas repetidas ao Redis)
+TASK_META_CACHE_TTL = 0.25
+TASK_META_CACHE_MAX_SIZE = 1024
+_task_meta_cache: "OrderedDict[str, Tuple[float, Dict[str, Any]]]" = OrderedDict()
+_task_meta_locks: Dict[str, asyncio.Lock] = {}
+# Coroutines usando cada lock; o lock só é descartado quando chega a zero
+_task_meta_waiters: Dict[str, int] = {}
+
+# Respostas já serializadas de tarefas em estado final (imutáveis)
+TERMINAL_CACHE_TTL = 3600
+TERMINAL_CACHE_MAX_SIZE = 10_000
+_terminal_cache: "OrderedDict[str, Tuple[float, bytes]]" = OrderedDict()
+
+# Envio de tarefas em lote (opcional, ativado via TASK_BATCH_ENABLED=true)
+TASK_BATCH_ENABLED = os.getenv("TASK_BATCH_ENABLED", "false").lower() == "true"
+task_submitter = TaskSubmitter(
+    celery_app,
+    max_batch=int(os.getenv("TASK_BATCH_MAX_SIZE", "50")),
+    window=float(os.getenv("TASK_BATCH_WINDOW_MS", "5")) / 1000,
+)
+
+# Relógio em cache, atualizado em background a cada CLOCK_TICK segundos
+CLOCK_TICK = 0.1
+_cached_now: Optional[datetime] = None
+_clock_task: Optional[asyncio.Task] = None
+
+
+def _now() -> datetime:
+    """Retorna o horário atual em cache (precisão de ~CLOCK_TICK)."""
+    return _cached_now or datetime.now()
+
+
+async def _refresh_clock() -> None:
+    """Atualiza o horário em cache periodicamente."""
+    global _cached_now
+    while True:
+        _cached_now = datetime.now()
+        await asyncio.sleep(CLOCK_TICK)
+
+
+@app.on_event("startup")
+async def start_clock():
+    """Inicia a atualização do relógio em cache."""
+    global _clock_task
+    _clock_task = asyncio.create_task(_refresh_clock())
+
+
+@app.on_event("shutdown")
+async def stop_clock():
+    """Encerra a atualização do relógio em cache."""
+    global _cached_now
+    if _clock_task is not None:
+        _clock_task.cancel()
+    _cached_now = None
+
+
+@app.on_event("startup")
+async def start_task_submitter():
+    """Inicia o envio de tarefas em lote, se habilitado."""
+    if TASK_BATCH_ENABLED:
+        task_submitter.start()
 
-@app.post("/scraping", response_model=ScrapingTaskResponse)
-async def create_task(request: Union[ScrapingTaskRequest, OrderRequest]):
+
+@app.on_event("shutdown")
+async def stop_task_submitter():
+    """Publica tarefas pendentes e encerra o envio em lote."""
+    await task_submitter.stop()
+
+
+async def _submit_task(task, task_data: Dict[str, Any]) -> str:
+    """Envia tarefa para o Celery (em lote, se habilitado) e retorna seu ID."""
+    if task_submitter.running:
+        return await task_submitter.submit(task, task_data)
+    # Publicação bloqueante no broker fora do event loop
+    async_result = await asyncio.to_thread(task.delay, task_data)
+    return async_result.id
+
+
+def _fetch_task_meta(task_id: str) -> Dict[str, Any]:
+    """Busca estado e resultado da tarefa no backend do Celery (uma única consulta)."""
+    meta = celery_app.backend.get_task_meta(task_id, cache=False)
+    return {
+        "status": meta.get("status", "PENDING"),
+        "result": meta.get("result"),
+        "traceback": meta.get("traceback"),
+    }
+
+
+def _get_cached_task_meta(task_id: str) -> Optional[Dict[str, Any]]:
+    """Retorna metadados em cache se ainda válidos."""
+    cached = _task_meta_cache.get(task_id)
+    if cached is None or cached[0] < time.monotonic():
+        return None
+    _task_meta_cache.move_to_end(task_id)
+    return cached[1]
+
+
+def _get_terminal_response(task_id: str) -> Optional[bytes]:
+    """Retorna a resposta serializada de uma tarefa finalizada, se em cache."""
+    cached = _terminal_cache.get(task_id)
+    if cached is None:
+        return None
+    if cached[0] < time.monotonic():
+        del _terminal_cache[task_id]
+        return None
+    _terminal_cache.move_to_end(task_id)
+    return cached[1]
+
+
+def _store_terminal_response(task_id: str, body: bytes) -> None:
+    """Armazena a resposta serializada de uma tarefa finalizada."""
+    _terminal_cache[task_id] = (time.monotonic() + TERMINAL_CACHE_TTL, body)
+    _terminal_cache.move_to_end(task_id)
+    while len(_terminal_cache) > TERMINAL_CACHE_MAX_SIZE:
+        _terminal_cache.popitem(last=False)
+
+
+async def _get_task_meta(task_id: str) -> Dict[str, Any]:
+    """
+    Obtém metadados da tarefa com cache de curta duração.
+
+    Consultas simultâneas para o mesmo task_id compartilham uma única
+    ida ao backend.
+    """
+    meta = _get_cached_task_meta(task_id)
+    if meta is not None:
+        return meta
+
+    lock = _task_meta_locks.setdefault(task_id, asyncio.Lock())
+    _task_meta_waiters[task_id] = _task_meta_waiters.get(task_id, 0) + 1
+    try:
+        async with lock:
+            meta = _get_cached_task_meta(task_id)
+            if meta is not None:
+                return meta
+
+            # Consulta bloqueante ao Redis fora do event loop
+            meta = await asyncio.to_thread(_fetch_task_meta, task_id)
+            _task_meta_cache[task_id] = (time.monotonic() + TASK_META_CACHE_TTL, meta)
+            _task_meta_cache.move_to_end(task_id)
+            while len(_task_meta_cache) > TASK_META_CACHE_MAX_SIZE:
+                _task_meta_cache.popitem(last=False)
+            return meta
+    finally:
+        waiters = _task_meta_waiters[task_id] - 1
+        if waiters:
+            _task_meta_waiters[task_id] = waiters
+        else:
+            del _task_meta_waiters[task_id]
+            del _task_meta_locks[task_id]
+
+
+@app.post(
+    "/scraping",
+    response_model=ScrapingTaskResponse,
+    openapi_extra=_task_request_openapi(),
+)
+async def create_task(
+    request: Union[ScrapingTaskRequest, OrderRequest] = Depends(parse_task_request),
+):
     """
     Cria uma nova tarefa de scraping ou pedido.
 
-    Detecta automaticamente o tipo de tarefa baseado nos dados recebidos:
-    - Se contém 'produtos': Tarefa de pedido (Fase 3)
-    - Se não contém 'produtos': Tarefa de scraping (Fase 2)
+    O tipo de tarefa é definido pelo campo 'task_type' ("scraping" ou "order");
+    se ausente, requisições com 'produtos' são tratadas como pedido (Fase 3)
+    e as demais como scraping (Fase 2).
 
     Args:
         request: Dados da tarefa (ScrapingTaskRequest ou OrderRequest)
@@ -45,29 +319,13 @@ async def create_task(request: Union[ScrapingTaskRequest, OrderRequest]):
         Resposta com ID da tarefa criada
     """
     try:
-        # Gerar ID único para a tarefa
-        task_id = str(uuid.uuid4())
-
-        # Detectar tipo de tarefa baseado na presença de 'produtos'
-        is_order_task = hasattr(request, "produtos") and hasattr(request, "id_pedido")
-
-        if is_order_task:
-            # TAREFA DE PEDIDO (Fase 3)
-            order_request = OrderRequest(**request.dict())
-
-            # Preparar dados para o Celery
-            task_data = {
-                "task_type": "order",
-                "usuario": order_request.usuario,
-                "senha": order_request.senha,
-                "id_pedido": order_request.id_pedido,
-                "produtos": [prod.dict() for prod in order_request.produtos],
-                "callback_url": order_request.callback_url,
-            }
+        if isinstance(request, OrderRequest):
+            # TAREFA DE PEDIDO (Fase 3) - já validada pelo FastAPI
+            # Dados para o Celery em uma única serialização do modelo
+            task_data = request.model_dump()
 
             # Enviar tarefa de pedido para processamento assíncrono
-            celery_task = execute_order.delay(task_data)
-            celery_task_id = celery_task.id
+            celery_task_id = await _submit_task(execute_order, task_data)
 
             # Criar resposta para pedido
             response = OrderStatus(
@@ -75,7 +333,7 @@ async def create_task(request: Union[ScrapingTaskRequest, OrderRequest]):
                 status="pending",
                 progress=0.0,
                 message="Tarefa de pedido criada com sucesso",
-                created_at=datetime.now(),
+                created_at=_now(),
                 started_at=None,
                 completed_at=None,
                 error=None,
@@ -83,27 +341,19 @@ async def create_task(request: Union[ScrapingTaskRequest, OrderRequest]):
             )
 
         else:
-            # TAREFA DE SCRAPING (Fase 2)
-            scraping_request = ScrapingTaskRequest(**request.dict())
-
-            # Preparar dados para o Celery
-            task_data = {
-                "task_type": "scraping",
-                "usuario": scraping_request.usuario,
-                "senha": scraping_request.senha,
-                "callback_url": scraping_request.callback_url,
-            }
+            # TAREFA DE SCRAPING (Fase 2) - já validada pelo FastAPI
+            # Dados para o Celery em uma única serialização do modelo
+            task_data = request.model_dump()
 
             # Enviar tarefa para processamento assíncrono
-            celery_task = execute_scraping.delay(task_data)
-            celery_task_id = celery_task.id
+            celery_task_id = await _submit_task(execute_scraping, task_data)
 
             # Criar resposta para scraping
             response = ScrapingTaskResponse(
                 task_id=celery_task_id,
                 status="pending",
                 message="Tarefa de scraping criada com sucesso",
-                created_at=datetime.now(),
+                created_at=_now(),
                 estimated_completion=None,
             )
 
@@ -113,7 +363,11 @@ async def create_task(request: Union[ScrapingTaskRequest, OrderRequest]):
         raise HTTPException(status_code=500, detail=f"Erro ao criar tarefa: {str(e)}")
 
 
-@app.get("/scraping/{task_id}", response_model=ScrapingTaskStatus)
+@app.get(
+    "/scraping/{task_id}",
+    response_model=ScrapingTaskStatus,
+    response_model_exclude_none=True,
+)
 async def get_task_status(task_id: str):
     """
     Consulta o status de uma tarefa de scraping.
@@ -125,30 +379,37 @@ async def get_task_status(task_id: str):
         Status atual da tarefa
     """
     try:
-        # Buscar tarefa no Celery
-        task_result = celery_app.AsyncResult(task_id)
+        # Tarefas finalizadas não mudam: responder direto do cache
+        cached_body = _get_terminal_response(task_id)
+        if cached_body is not None:
+            return Response(cached_body, media_type="application/json")
+
+        # Buscar tarefa no Celery (com cache)
+        # IDs desconhecidos também voltam como PENDING: o backend do Celery
+        # não distingue tarefa inexistente de tarefa ainda na fila
+        meta = await _get_task_meta(task_id)
 
-        if not task_result:
-            raise HTTPException(status_code=404, detail="Tarefa não encontrada")
+        state = meta["status"]
+        info = meta["result"]
 
         # Determinar status baseado no estado do Celery
-        if task_result.state == "PENDING":
+        if state == "PENDING":
             status = "pending"
             progress = 0.0
             message = "Tarefa aguardando processamento"
-        elif task_result.state == "PROGRESS":
+        elif state == "PROGRESS":
             status = "processing"
-            meta = task_result.info or {}
-            progress = meta.get("progress", 0.0)
-            message = meta.get("message", "Processando...")
-        elif task_result.state == "SUCCESS":
+            progress_info = info or {}
+            progress = progress_info.get("progress", 0.0)
+            message = progress_info.get("message", "Processando...")
+        elif state == "SUCCESS":
             status = "completed"
             progress = 1.0
             message = "Tarefa concluída com sucesso"
-        elif task_result.state == "FAILURE":
+        elif state == "FAILURE":
             status = "failed"
             progress = 0.0
-            message = f"Tarefa falhou: {task_result.info}"
+            message = f"Tarefa falhou: {info}"
         else:
             status = "unknown"
             progress = 0.0
@@ -161,7 +422,7 @@ async def get_task_status(task_id: str):
             status=status,
             progress=progress,
             message=message,
-            created_at=datetime.now(),
+            created_at=_now(),
             started_at=None,
             completed_at=None,
             error=None,
@@ -170,14 +431,16 @@ async def get_task_status(task_id: str):
 
         # Adicionar informações específicas baseadas no status
         if status == "completed":
-            response.result = task_result.result
+            response.result = info
         elif status == "failed":
-            response.error = str(task_result.info)
+            response.error = str(info)
 
-        return response
+        # Serializa diretamente (sem revalidar o modelo de resposta)
+        body = response.model_dump_json(exclude_none=True).encode()
+        if status in ("completed", "failed"):
+            _store_terminal_response(task_id, body)
+        return Response(body, media_type="application/json")
 
-    except HTTPException:
-        raise
     except Exception as e:
         raise HTTPException(
             status_code=500, detail=f"Erro ao consultar status da tarefa: {str(e)}"
@@ -187,27 +450,13 @@ async def get_task_status(task_id: str):
 @app.get("/health")
 async def health_check():
     """Endpoint de verificação de saúde da API."""
-    return {
-        "status": "healthy",
-        "timestamp": datetime.now().isoformat(),
-        "service": "Servimed Scraping & Orders API",
-        "phases": ["Fase 1: Scraping", "Fase 2: Filas", "Fase 3: Pedidos"],
-    }
+    timestamp = _now().isoformat().encode()
+    return Response(
+        _HEALTH_PREFIX + timestamp + _HEALTH_SUFFIX, media_type="application/json"
+    )
 
 
 @app.get("/")
 async def root():
     """Endpoint raiz da API."""
-    return {
-        "message": "Servimed Scraping & Orders API - Fases 2 e 3",
-        "version": "2.0.0",
-        "endpoints": {
-            "create_task": "POST /scraping (Scraping ou Pedido)",
-            "check_status": "GET /scraping/{task_id}",
-            "health": "GET /health",
-        },
-        "supported_tasks": {
-            "scraping": "Extração de produtos (Fase 2)",
-            "order": "Processamento de pedidos (Fase 3)",
-        },
-    }
+    return Response(_ROOT_BODY, media_type="application/json")
@@ -0,0 +1,115 @@
+"""
+Envio de tarefas Celery em lote para a API.
+
+Agrupa as submissões recebidas em uma janela curta de tempo e publica
+todas reutilizando um único producer (uma conexão com o broker).
+"""
+
+import asyncio
+import logging
+import uuid
+from typing import Any, Dict, List, Optional, Tuple
+
+from celery import Celery, Task
+
+
+logger = logging.getLogger(__name__)
+
+# (tarefa, dados, task_id, future)
+_PendingSubmission = Tuple[Task, Dict[str, Any], str, asyncio.Future]
+
+
+class TaskSubmitter:
+    """
+    Submissor de tarefas em lote.
+
+    Endpoints aguardam um Future enquanto um worker em background drena a
+    fila a cada `window` segundos (ou ao atingir `max_batch` itens) e
+    publica o lote inteiro com um único producer.
+    """
+
+    def __init__(self, app: Celery, max_batch: int = 50, window: float = 0.005):
+        """Inicializa o submissor com o app Celery e parâmetros do lote."""
+        self.app = app
+        self.max_batch = max_batch
+        self.window = window
+        self._queue: Optional[asyncio.Queue] = None
+        self._worker: Optional[asyncio.Task] = None
+
+    @property
+    def running(self) -> bool:
+        """Indica se o worker de envio está ativo."""
+        return self._worker is not None and not self._worker.done()
+
+    def start(self) -> None:
+        """Inicia o worker de envio no event loop atual."""
+        if self.running:
+            return
+        self._queue = asyncio.Queue()
+        self._worker = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        """Publica submissões pendentes e encerra o worker."""
+        if not self.running:
+            return
+        await self._queue.join()
+        self._worker.cancel()
+        try:
+            await self._worker
+        except asyncio.CancelledError:
+            pass
+        self._worker = None
+
+    async def submit(self, task: Task, task_data: Dict[str, Any]) -> str:
+        """
+        Enfileira uma tarefa para envio em lote.
+
+        Args:
+            task: Tarefa Celery a ser executada
+            task_data: Dados da tarefa
+
+        Returns:
+            ID da tarefa publicada
+        """
+        task_id = str(uuid.uuid4())
+        future = asyncio.get_running_loop().create_future()
+        await self._queue.put((task, task_data, task_id, future))
+        await future
+        return task_id
+
+    async def _run(self) -> None:
+        """Drena a fila em lotes e publica cada lote."""
+        loop = asyncio.get_running_loop()
+        while True:
+            batch: List[_PendingSubmission] = [await self._queue.get()]
+            deadline = loop.time() + self.window
+
+            while len(batch) < self.max_batch:
+                timeout = deadline - loop.time()
+                if timeout <= 0:
+                    break
+                try:
+                    batch.append(await asyncio.wait_for(self._queue.get(), timeout))
+                except asyncio.TimeoutError:
+                    break
+
+            try:
+                await asyncio.to_thread(self._publish_batch, batch)
+            except Exception as e:
+                logger.error(f"Erro ao publicar lote de {len(batch)} tarefas: {e}")
+                for _, _, _, future in batch:
+                    if not future.done():
+                        future.set_exception(e)
+            else:
+                for _, _, _, future in batch:
+                    if not future.done():
+                        future.set_result(None)
+            finally:
+                for _ in batch:
+                    self._queue.task_done()
+
+    def _publish_batch(self, batch: List[_PendingSubmission]) -> None:
+        """Publica todas as tarefas do lote com um único producer."""
+        with self.app.producer_or_acquire() as producer:
+            for task, task_data, task_id, _ in batch:
+                task.apply_async(args=[task_data], task_id=task_id, producer=producer)
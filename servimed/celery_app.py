@@ -7,20 +7,40 @@ from celery import Celery
 
 # Configuração básica
 CELERY_BROKER_URL = os.getenv("CELERY_BROKER_URL", "redis://localhost:6379/0")
+CELERY_RESULT_BACKEND = os.getenv("CELERY_RESULT_BACKEND", CELERY_BROKER_URL)
+
+# Opções de conexão Redis (keepalive e timeouts)
+REDIS_TRANSPORT_OPTIONS = {
+    "socket_keepalive": True,
+    "socket_timeout": 5,
+    "socket_connect_timeout": 5,
+    "retry_on_timeout": True,
+    "health_check_interval": 30,
+}
 
 # Criar app Celery 
 celery_app = Celery(
     "servimed",
     broker=CELERY_BROKER_URL,
+    backend=CELERY_RESULT_BACKEND,
     include=["tasks.scraping_tasks", "tasks.order_tasks"],
 ) 
 
 # Configurações 
 celery_app.conf.update(
-    task_serializer="json",
-    accept_content=["json"],
+    task_serializer="msgpack",
+    result_serializer="msgpack",
+    accept_content=["msgpack", "json"],
+    result_accept_content=["msgpack", "json"],
+    result_compression="zstd",
     timezone="America/Sao_Paulo",
     enable_utc=True,
     worker_concurrency=4,
     task_default_queue="scraping",
+    broker_pool_limit=200,
+    broker_transport_options=REDIS_TRANSPORT_OPTIONS,
+    result_backend_transport_options=REDIS_TRANSPORT_OPTIONS,
+    redis_max_connections=200,
+    redis_socket_keepalive=True,
+    broker_connection_retry_on_startup=True,
 )
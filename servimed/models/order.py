@@ -3,8 +3,8 @@ Modelos de dados para pedidos - Fase 3
 Sistema de pedidos integrado ao scraping Servimed
 """
 
-from typing import List, Optional
-from pydantic import BaseModel, Field, validator
+from typing import List, Literal, Optional
+from pydantic import BaseModel, ConfigDict, Field, field_validator
 from datetime import datetime
 
 
@@ -13,39 +13,41 @@ class ProductItem(BaseModel):
 
     gtin: str = Field(..., description="Código GTIN/EAN do produto")
     codigo: str = Field(..., description="Código interno do produto")
-    quantidade: int = Field(..., ge=1, description="Quantidade solicitada")
+    quantidade: int = Field(..., description="Quantidade solicitada")
 
-    @validator("quantidade")
+    @field_validator("quantidade")
+    @classmethod
     def validate_quantidade(cls, v):
         if v < 1:
             raise ValueError("Quantidade deve ser maior que zero")
         return v
 
-    class Config:
-        schema_extra = {
+    model_config = ConfigDict(
+        json_schema_extra={
             "example": {"gtin": "7899095203136", "codigo": "446231", "quantidade": 1}
         }
+    )
 
 
 class OrderRequest(BaseModel):
     """Requisição para criar um pedido - Fase 3"""
 
+    task_type: Literal["order"] = Field("order", description="Tipo da tarefa")
     usuario: str = Field(..., description="Usuário para login no Servimed")
     senha: str = Field(..., description="Senha para login no Servimed")
     id_pedido: str = Field(..., description="Identificador único do pedido")
-    produtos: List[ProductItem] = Field(
-        ..., min_items=1, description="Lista de produtos do pedido"
-    )
+    produtos: List[ProductItem] = Field(..., description="Lista de produtos do pedido")
     callback_url: str = Field(..., description="URL para callback da confirmação")
 
-    @validator("produtos")
+    @field_validator("produtos")
+    @classmethod
     def validate_produtos(cls, v):
         if not v:
             raise ValueError("Pedido deve ter pelo menos um produto")
         return v
 
-    class Config:
-        schema_extra = {
+    model_config = ConfigDict(
+        json_schema_extra={
             "example": {
                 "usuario": "fornecedor_user",
                 "senha": "fornecedor_pass",
@@ -56,6 +58,7 @@ class OrderRequest(BaseModel):
                 "callback_url": "https://desafio.cotefacil.net",
             }
         }
+    )
 
 
 class OrderResponse(BaseModel):
@@ -64,10 +67,11 @@ class OrderResponse(BaseModel):
     codigo_confirmacao: str = Field(..., description="Código de confirmação do pedido")
     status: str = Field(..., description="Status do pedido")
 
-    class Config:
-        schema_extra = {
+    model_config = ConfigDict(
+        json_schema_extra={
             "example": {"codigo_confirmacao": "ABC987", "status": "pedido_realizado"}
         }
+    )
 
 
 class Order(BaseModel):
@@ -78,8 +82,8 @@ class Order(BaseModel):
     status: Optional[str] = Field(None, description="Status atual do pedido")
     itens: List[ProductItem] = Field(..., description="Itens do pedido")
 
-    class Config:
-        schema_extra = {
+    model_config = ConfigDict(
+        json_schema_extra={
             "example": {
                 "id": 64,
                 "codigo_fornecedor": None,
@@ -89,6 +93,7 @@ class Order(BaseModel):
                 ],
             }
         }
+    )
 
 
 class OrderStatus(BaseModel):
@@ -106,15 +111,16 @@ class OrderStatus(BaseModel):
     error: Optional[str] = Field(None, description="Mensagem de erro (se houver)")
     result: Optional[dict] = Field(None, description="Resultado da tarefa (se concluída)")
 
-    @validator("progress")
+    @field_validator("progress")
+    @classmethod
     def validate_progress(cls, v):
         """Valida progresso entre 0.0 e 1.0."""
         if v is not None and (v < 0.0 or v > 1.0):
             raise ValueError("Progresso deve estar entre 0.0 e 1.0")
         return v
 
-    class Config:
-        schema_extra = {
+    model_config = ConfigDict(
+        json_schema_extra={
             "example": {
                 "task_id": "uuid-1234",
                 "status": "pending",
@@ -127,3 +133,4 @@ class OrderStatus(BaseModel):
                 "result": None,
             }
         }
+    )
@@ -7,9 +7,13 @@ Este módulo define as estruturas de dados para:
 - Status de processamento
 """
 
-from typing import Optional, List, Dict, Any
+from typing import Optional, List, Dict, Any, Literal
 from datetime import datetime
-from pydantic import BaseModel, Field, validator
+from pydantic import BaseModel, ConfigDict, Field, field_validator
+
+
+# Prefixos aceitos para URLs de callback
+_URL_PREFIXES = ("http://", "https://")
 
 
 class ScrapingTaskRequest(BaseModel):
@@ -17,31 +21,45 @@ class ScrapingTaskRequest(BaseModel):
     Estrutura enviada pelo cliente para criar uma nova tarefa.
     """
     
+    task_type: Literal["scraping"] = Field("scraping", description="Tipo da tarefa")
     usuario: str = Field(..., description="Usuário fornecedor para autenticação")
     senha: str = Field(..., description="Senha do usuário fornecedor")
     callback_url: str = Field(..., description="URL da API de callback")
     
-    @validator("usuario")
+    @field_validator("usuario")
+    @classmethod
     def validate_usuario(cls, v):
         """Valida que o usuário não esteja vazio."""
         if not v or len(v.strip()) < 1:
             raise ValueError("Usuário não pode estar vazio")
         return v.strip()
     
-    @validator("senha")
+    @field_validator("senha")
+    @classmethod
     def validate_senha(cls, v):
         """Valida que a senha não esteja vazia."""
         if not v or len(v.strip()) < 1:
             raise ValueError("Senha não pode estar vazia")
         return v
     
-    @validator("callback_url")
+    @field_validator("callback_url")
+    @classmethod
     def validate_callback_url(cls, v):
         """Valida formato básico da URL."""
-        if not v or not v.startswith(("http://", "https://")):
+        if not v or not v.startswith(_URL_PREFIXES):
             raise ValueError("URL de callback deve ser uma URL válida")
         return v.strip()
 
+    model_config = ConfigDict(
+        json_schema_extra={
+            "example": {
+                "usuario": "fornecedor_user",
+                "senha": "fornecedor_pass",
+                "callback_url": "https://desafio.cotefacil.net",
+            }
+        }
+    )
+
 
 class ScrapingTaskResponse(BaseModel):
     """
@@ -56,7 +74,8 @@ class ScrapingTaskResponse(BaseModel):
     created_at: datetime = Field(..., description="Timestamp de criação da tarefa")
     estimated_completion: Optional[datetime] = Field(None, description="Estimativa de conclusão")
     
-    @validator("status")
+    @field_validator("status")
+    @classmethod
     def validate_status(cls, v):
         """Valida status da tarefa."""
         valid_statuses = ["pending", "processing", "completed", "failed"]
@@ -64,6 +83,18 @@ class ScrapingTaskResponse(BaseModel):
             raise ValueError(f"Status deve ser um dos: {', '.join(valid_statuses)}")
         return v
 
+    model_config = ConfigDict(
+        json_schema_extra={
+            "example": {
+                "task_id": "uuid-1234",
+                "status": "pending",
+                "message": "Tarefa de scraping criada com sucesso",
+                "created_at": "2025-08-17T10:00:00",
+                "estimated_completion": None,
+            }
+        }
+    )
+
 
 class ScrapingTaskStatus(BaseModel):
     """
@@ -82,13 +113,30 @@ class ScrapingTaskStatus(BaseModel):
     error: Optional[str] = Field(None, description="Mensagem de erro (se houver)")
     result: Optional[Dict[str, Any]] = Field(None, description="Resultado da tarefa (se concluída)")
     
-    @validator("progress")
+    @field_validator("progress")
+    @classmethod
     def validate_progress(cls, v):
         """Valida progresso entre 0.0 e 1.0."""
         if v is not None and (v < 0.0 or v > 1.0):
             raise ValueError("Progresso deve estar entre 0.0 e 1.0")
         return v
 
+    model_config = ConfigDict(
+        json_schema_extra={
+            "example": {
+                "task_id": "uuid-1234",
+                "status": "completed",
+                "progress": 1.0,
+                "message": "Tarefa concluída com sucesso",
+                "created_at": "2025-08-17T10:00:00",
+                "started_at": None,
+                "completed_at": None,
+                "error": None,
+                "result": {"total_products": 298, "products": []},
+            }
+        }
+    )
+
 
 class ScrapingResult(BaseModel):
     """
@@ -99,19 +147,27 @@ class ScrapingResult(BaseModel):
     
     task_id: str = Field(..., description="ID da tarefa que gerou o resultado")
     total_products: int = Field(..., description="Total de produtos extraídos")
-    products: List[Dict[str, Any]] = Field(..., description="Lista de produtos extraídos")
+    products: List[Dict[str, Any]] = Field(
+        default_factory=list,
+        description="Amostra dos produtos extraídos (a lista completa vai para o callback)",
+    )
+    products_key: Optional[str] = Field(
+        None, description="Chave Redis com a lista completa de produtos (JSON)"
+    )
     extraction_time: float = Field(..., description="Tempo de extração em segundos")
     callback_sent: bool = Field(..., description="Indica se foi enviado para callback")
     callback_response: Optional[Dict[str, Any]] = Field(None, description="Resposta da API de callback")
     
-    @validator("total_products")
+    @field_validator("total_products")
+    @classmethod
     def validate_total_products(cls, v):
         """Valida total de produtos."""
         if v < 0:
             raise ValueError("Total de produtos não pode ser negativo")
         return v
     
-    @validator("extraction_time")
+    @field_validator("extraction_time")
+    @classmethod
     def validate_extraction_time(cls, v):
         """Valida tempo de extração."""
         if v < 0:
@@ -22,25 +22,47 @@ def main():
     port = int(os.getenv("FASTAPI_PORT", "8000"))
     reload = os.getenv("FASTAPI_RELOAD", "true").lower() == "true"
     log_level = os.getenv("FASTAPI_LOG_LEVEL", "info")
+    access_log = os.getenv("FASTAPI_ACCESS_LOG", "false").lower() == "true"
+    workers = int(os.getenv("FASTAPI_WORKERS", "1"))
+
+    # uvloop + httptools (C) quando disponíveis; uvloop não suporta Windows
+    default_loop = "asyncio" if sys.platform.startswith("win") else "uvloop"
+    loop = os.getenv("FASTAPI_LOOP", default_loop)
+    http = os.getenv("FASTAPI_HTTP", "httptools")
 
     print(f"🚀 Iniciando Servimed Scraping API...")
     print(f"📍 Host: {host}")
     print(f"🔌 Porta: {port}")
     print(f"🔄 Reload: {reload}")
     print(f"📝 Log Level: {log_level}")
+    print(f"⚡ Loop/HTTP: {loop}/{http}")
+    print(f"👷 Workers: {workers}")
     print(f"🌐 URL: http://{host}:{port}")
     print(f"📚 Docs: http://{host}:{port}/docs")
     print("-" * 50)
 
+    # Com reload/workers o Uvicorn inicia novos processos (spawn), que
+    # reimportam a aplicação; nesse caso é preciso passar a string de import.
+    # Em processo único, reutiliza o app já importado e pré-gera o schema
+    # OpenAPI (modelos Pydantic) antes de aceitar requisições.
+    if reload or workers > 1:
+        app_target = "api.main:app"
+    else:
+        app.openapi()
+        app_target = app
+
     try:
         # Iniciar servidor Uvicorn
         uvicorn.run(
-            "api.main:app",
+            app_target,
             host=host,
             port=port,
             reload=reload,
             log_level=log_level,
-            access_log=True,
+            access_log=access_log,
+            loop=loop,
+            http=http,
+            workers=workers,
         )
 
     except KeyboardInterrupt:
@@ -0,0 +1,102 @@
+"""
+Funções compartilhadas pelos scripts de teste.
+
+Importado diretamente pelos scripts desta pasta (`from helpers import ...`),
+que são executados como arquivos avulsos.
+"""
+
+import os
+import sys
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+sys.path.append(os.path.join(os.path.dirname(__file__), ".."))
+
+from servimed.utils.json_backend import dumps_bytes, loads
+
+JSON_HEADERS = {"Content-Type": "application/json"}
+
+# Saída decorativa (desativada com SERVIMED_TEST_VERBOSE=0, ex.: em CI)
+VERBOSE = os.environ.get("SERVIMED_TEST_VERBOSE", "1") == "1"
+
+# Sessão HTTP compartilhada (reutiliza conexões entre requisições)
+SESSION = requests.Session()
+SESSION.mount(
+    "http://",
+    HTTPAdapter(
+        pool_connections=10,
+        pool_maxsize=20,
+        max_retries=Retry(total=3, backoff_factor=0.2),
+    ),
+)
+
+
+def log(msg: str = "", *args) -> None:
+    """
+    Imprime saída decorativa no estilo `%` do logging.
+
+    A mensagem só é formatada com `args` quando a saída está ativa, então
+    chamadas silenciadas não pagam o custo de formatação.
+    """
+    if VERBOSE:
+        print(msg % args if args else msg)
+
+
+def parse_json(response: requests.Response):
+    """Decodifica o corpo JSON da resposta com o backend JSON mais rápido."""
+    return loads(response.content)
+
+
+def poll_delays(initial: float = 0.5, cap: float = 10.0):
+    """Gera intervalos de polling com backoff exponencial limitado a `cap`."""
+    delay = initial
+    while True:
+        yield delay
+        delay = min(delay * 2, cap)
+
+
+def wait_for_celery_result(task_id: str, max_wait: float):
+    """
+    Aguarda a conclusão da tarefa direto no backend do Celery.
+
+    Bloqueia em uma única espera (pub/sub no Redis) em vez de consultar
+    a API repetidamente.
+
+    Returns:
+        "done" se a tarefa terminou, "timeout" se o tempo esgotou ou
+        None se o backend do Celery não estiver acessível.
+    """
+    # App Celery é opcional: sem ele os scripts usam apenas a API
+    try:
+        from celery.exceptions import TimeoutError as CeleryTimeoutError
+        from celery.result import AsyncResult
+        from celery_app import celery_app
+    except ImportError:
+        return None
+
+    try:
+        # Falha rápida se o Redis do backend não responde
+        client = getattr(celery_app.backend, "client", None)
+        if client is not None:
+            client.ping()
+        AsyncResult(task_id, app=celery_app).get(timeout=max_wait, propagate=False)
+        return "done"
+    except CeleryTimeoutError:
+        return "timeout"
+    except Exception as e:
+        print(f"Backend do Celery indisponível ({e}), usando polling da API")
+        return None
+
+
+__all__ = [
+    "JSON_HEADERS",
+    "SESSION",
+    "VERBOSE",
+    "dumps_bytes",
+    "log",
+    "parse_json",
+    "poll_delays",
+    "wait_for_celery_result",
+]
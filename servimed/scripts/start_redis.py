@@ -5,6 +5,7 @@ Este script verifica se o Redis está rodando e inicia se necessário.
 Se Redis real não estiver disponível, usa fakeredis para testes locais.
 """
 
+import socket
 import subprocess
 import sys
 import time
@@ -27,13 +28,32 @@ except ImportError:
     FAKEREDIS_AVAILABLE = False
 
 
+def _port_open(host="localhost", port=6379, timeout=0.2):
+    """Verifica rapidamente se há algo escutando na porta do Redis."""
+    try:
+        with socket.create_connection((host, port), timeout=timeout):
+            return True
+    except OSError:
+        return False
+
+
 def check_redis_connection():
     """Verifica se consegue conectar ao Redis real."""
     if not REDIS_AVAILABLE:
         return False
 
+    # Evita criar cliente (e aguardar timeout) se a porta está fechada
+    if not _port_open():
+        return False
+
     try:
-        r = redis.Redis(host="localhost", port=6379, db=0)
+        r = redis.Redis(
+            host="localhost",
+            port=6379,
+            db=0,
+            socket_connect_timeout=0.2,
+            socket_timeout=0.5,
+        )
         r.ping()
         return True
     except Exception:
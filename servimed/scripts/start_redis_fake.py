@@ -4,21 +4,44 @@ Script para iniciar Redis emulado (fakeredis) - Fase 2.
 Este script inicia um Redis emulado para testes sem precisar instalar Redis.
 """
 
-import fakeredis
-import time
+import signal
+import sys
 import threading
 
+# Servidor emulado e pool de conexões compartilhados no processo
+_server = None
+_pool = None
+
+
+def get_client():
+    """
+    Retorna cliente Redis ligado ao servidor emulado compartilhado.
+
+    O servidor e o pool são criados na primeira chamada; chamadas seguintes
+    (inclusive de outros scripts) reutilizam os mesmos dados em memória.
+    """
+    global _server, _pool
+
+    import redis
+
+    if _pool is None:
+        import fakeredis
+
+        _server = fakeredis.FakeServer()
+        _pool = redis.ConnectionPool(
+            connection_class=fakeredis.FakeConnection, server=_server
+        )
+
+    return redis.Redis(connection_pool=_pool)
+
 
 def start_fake_redis():
     """Inicia Redis emulado."""
     try:
         print("🚀 Iniciando Redis emulado (fakeredis)...")
 
-        # Criar servidor Redis emulado
-        server = fakeredis.FakeServer()
-
-        # Criar cliente Redis
-        r = fakeredis.FakeRedis(server=server)
+        # Cliente ligado ao servidor emulado compartilhado
+        r = get_client()
 
         # Testar conexão
         r.set("test", "redis_working")
@@ -35,12 +58,19 @@ def start_fake_redis():
             print("⏳ Servidor emulado rodando...")
             print("💡 Pressione Ctrl+C para parar")
 
-            try:
-                while True:
-                    time.sleep(1)
-            except KeyboardInterrupt:
-                print("\n⏹️ Parando Redis emulado...")
-                print("✅ Redis emulado parado")
+            # Bloqueia sem acordar periodicamente até SIGINT/SIGTERM
+            stop = threading.Event()
+            signal.signal(signal.SIGINT, lambda *_: stop.set())
+            signal.signal(signal.SIGTERM, lambda *_: stop.set())
+            if sys.platform.startswith("win"):
+                # No Windows, wait() sem timeout não é interrompido por Ctrl+C
+                while not stop.wait(1):
+                    pass
+            else:
+                stop.wait()
+
+            print("\n⏹️ Parando Redis emulado...")
+            print("✅ Redis emulado parado")
 
         else:
             print("❌ Falha no Redis emulado")
@@ -4,56 +4,51 @@ Script para iniciar Workers Celery - Fase 2.
 Este script inicia os workers Celery para processar tarefas de scraping.
 """
 
-import subprocess
 import sys
-import time
 import os
 from pathlib import Path
 
 
 def start_celery_worker():
-    """Inicia o worker Celery."""
+    """Inicia o worker Celery no próprio processo."""
     try:
         print(" Iniciando Worker Celery...")
 
-        # Configurar variáveis de ambiente
-        env = os.environ.copy()
-        env["CELERY_BROKER_URL"] = "redis://localhost:6379/0"
-        env["CELERY_RESULT_BACKEND"] = "redis://localhost:6379/0"
-
-        # Comando para iniciar worker
-        cmd = [
-            sys.executable,
-            "-m",
-            "celery",
-            "-A",
-            "queues.celery_config",
+        # Configurar variáveis de ambiente (antes de importar o app)
+        os.environ["CELERY_BROKER_URL"] = "redis://localhost:6379/0"
+        os.environ["CELERY_RESULT_BACKEND"] = "redis://localhost:6379/0"
+
+        # Argumentos do worker: tarefas I/O-bound rodam no pool gevent
+        argv = [
             "worker",
             "--loglevel=info",
-            "--concurrency=2",
+            "--pool=gevent",
+            "--concurrency=50",
         ]
 
-        print(f" Comando: {' '.join(cmd)}")
+        print(f" Argumentos: {' '.join(argv)}")
         print(" Broker: redis://localhost:6379/0")
-        print(" Concorrência: 2 workers")
+        print(" Pool: gevent (50 tarefas simultâneas)")
         print(" Log Level: info")
         print("-" * 50)
 
-        # Iniciar worker
-        process = subprocess.Popen(cmd, env=env, cwd=Path(__file__).parent.parent)
+        # Importar app Celery no processo atual (sem subprocesso)
+        project_root = Path(__file__).parent.parent
+        sys.path.insert(0, str(project_root))
+        os.chdir(project_root)
 
-        print(" Worker Celery iniciado!")
-        print(f" PID: {process.pid}")
-        print(" Pressione Ctrl+C para parar")
+        # O monkey patching do gevent precisa vir antes de importar o app
+        # (o comando `celery` faz isso sozinho; worker_main não)
+        from celery import maybe_patch_concurrency
+
+        maybe_patch_concurrency(argv)
 
-        # Aguardar processo
-        try:
-            process.wait()
-        except KeyboardInterrupt:
-            print("\n Parando worker...")
-            process.terminate()
-            process.wait()
-            print(" Worker parado")
+        from celery_app import celery_app
+
+        # Bloqueia até o encerramento (Ctrl+C faz warm shutdown)
+        print(" Pressione Ctrl+C para parar")
+        celery_app.worker_main(argv=argv)
+        print(" Worker parado")
 
     except Exception as e:
         print(f" Erro ao iniciar worker: {e}")
@@ -4,58 +4,46 @@ Script para iniciar Workers Celery com Redis emulado - Fase 2.
 Este script inicia os workers Celery usando fakeredis para testes.
 """
 
-import subprocess
 import sys
-import time
 import os
 from pathlib import Path
 
 
 def start_celery_worker():
-    """Inicia o worker Celery."""
+    """Inicia o worker Celery no próprio processo."""
     try:
         print(" Iniciando Worker Celery com Redis emulado...")
 
-        # Configurar variáveis de ambiente para fakeredis
-        env = os.environ.copy()
-        env["CELERY_BROKER_URL"] = "memory://"
-        env["CELERY_RESULT_BACKEND"] = "rpc://"
-
-        # Comando para iniciar worker
-        cmd = [
-            sys.executable,
-            "-m",
-            "celery",
-            "-A",
-            "queues.celery_config",
+        # Configurar variáveis de ambiente para fakeredis (antes de importar o app)
+        os.environ["CELERY_BROKER_URL"] = "memory://"
+        os.environ["CELERY_RESULT_BACKEND"] = "rpc://"
+
+        # Argumentos do worker
+        argv = [
             "worker",
             "--loglevel=info",
             "--concurrency=2",
             "--pool=solo",  # Usar pool solo para testes
         ]
 
-        print(f" Comando: {' '.join(cmd)}")
+        print(f" Argumentos: {' '.join(argv)}")
         print(" Broker: memory:// (emulado)")
         print(" Concorrência: 2 workers")
         print(" Log Level: info")
         print(" Usando pool solo para testes")
         print("-" * 50)
 
-        # Iniciar worker
-        process = subprocess.Popen(cmd, env=env, cwd=Path(__file__).parent.parent)
+        # Importar app Celery no processo atual (sem subprocesso)
+        project_root = Path(__file__).parent.parent
+        sys.path.insert(0, str(project_root))
+        os.chdir(project_root)
 
-        print(" Worker Celery iniciado!")
-        print(f" PID: {process.pid}")
-        print(" Pressione Ctrl+C para parar")
+        from celery_app import celery_app
 
-        # Aguardar processo
-        try:
-            process.wait()
-        except KeyboardInterrupt:
-            print("\n Parando worker...")
-            process.terminate()
-            process.wait()
-            print(" Worker parado")
+        # Bloqueia até o encerramento (Ctrl+C faz warm shutdown)
+        print(" Pressione Ctrl+C para parar")
+        celery_app.worker_main(argv=argv)
+        print(" Worker parado")
 
     except Exception as e:
         print(f" Erro ao iniciar worker: {e}")
@@ -3,55 +3,98 @@ Script de teste para validar funcionalidades de pedidos - Fase 3
 Sistema de pedidos integrado ao scraping Servimed
 """
 
-import requests
+import io
 import json
+import os
+import sys
+import threading
 import time
-from datetime import datetime
+from concurrent.futures import ThreadPoolExecutor
+
+from helpers import (
+    JSON_HEADERS,
+    SESSION,
+    dumps_bytes as _dumps,
+    log as _LOG,
+    parse_json as _json,
+)
 
 # Configurações
 API_BASE_URL = "http://localhost:8000"
+SCRAPING_URL = f"{API_BASE_URL}/scraping"
+HEALTH_URL = f"{API_BASE_URL}/health"
+ROOT_URL = f"{API_BASE_URL}/"
 CALLBACK_URL = "https://httpbin.org/post"  # Serviço de teste para callback
 
+# Dados de teste para pedido (corpo serializado uma única vez)
+ORDER_DATA = {
+    "usuario": "teste@servimed.com",
+    "senha": "senha123",
+    "id_pedido": "PEDIDO_001",
+    "produtos": [
+        {"gtin": "7899095203136", "codigo": "446231", "quantidade": 2},
+        {"gtin": "7898636193493", "codigo": "444212", "quantidade": 1},
+    ],
+    "callback_url": CALLBACK_URL,
+}
+ORDER_BODY = _dumps(ORDER_DATA)
+ORDER_DATA_PRETTY = json.dumps(ORDER_DATA, indent=2)
+
+# Saída por thread: testes concorrentes escrevem em buffers próprios
+_thread_output = threading.local()
+
+
+class _ThreadLocalStdout(io.TextIOBase):
+    """Redireciona prints da thread atual para seu buffer, se houver."""
+
+    def __init__(self, stream):
+        self._stream = stream
+
+    def write(self, text):
+        buffer = getattr(_thread_output, "buffer", None)
+        return (buffer or self._stream).write(text)
+
+    def flush(self):
+        self._stream.flush()
+
+
+def _run_buffered(func):
+    """Executa um teste capturando sua saída em um buffer próprio."""
+    _thread_output.buffer = io.StringIO()
+    try:
+        func()
+    finally:
+        output = _thread_output.buffer.getvalue()
+        _thread_output.buffer = None
+    return output
+
 
 def test_order_creation():
     """
     Testa criação de tarefa de pedido via API
     """
-    print(" TESTE 1: Criação de Tarefa de Pedido")
-    print("=" * 50)
-
-    # Dados de teste para pedido
-    order_data = {
-        "usuario": "teste@servimed.com",
-        "senha": "senha123",
-        "id_pedido": "PEDIDO_001",
-        "produtos": [
-            {"gtin": "7899095203136", "codigo": "446231", "quantidade": 2},
-            {"gtin": "7898636193493", "codigo": "444212", "quantidade": 1},
-        ],
-        "callback_url": CALLBACK_URL,
-    }
+    _LOG(" TESTE 1: Criação de Tarefa de Pedido\n" + "=" * 50)
 
     try:
-        print(f"📤 Enviando pedido para: {API_BASE_URL}/scraping")
-        print(f"📋 Dados do pedido: {json.dumps(order_data, indent=2)}")
+        _LOG("📤 Enviando pedido para: %s", SCRAPING_URL)
+        _LOG("📋 Dados do pedido: %s", ORDER_DATA_PRETTY)
 
         # Fazer POST para criar tarefa de pedido
-        response = requests.post(
-            f"{API_BASE_URL}/scraping",
-            json=order_data,
-            headers={"Content-Type": "application/json"},
+        response = SESSION.post(
+            SCRAPING_URL,
+            data=ORDER_BODY,
+            headers=JSON_HEADERS,
             timeout=30,
         )
 
-        print(f" Status Code: {response.status_code}")
+        _LOG(" Status Code: %s", response.status_code)
 
         if response.status_code == 200:
-            result = response.json()
-            print(" Tarefa de pedido criada com sucesso!")
-            print(f" Task ID: {result.get('task_id')}")
-            print(f" Status: {result.get('status')}")
-            print(f" Mensagem: {result.get('message')}")
+            result = _json(response)
+            _LOG(" Tarefa de pedido criada com sucesso!")
+            _LOG(" Task ID: %s", result.get("task_id"))
+            _LOG(" Status: %s", result.get("status"))
+            _LOG(" Mensagem: %s", result.get("message"))
 
             return result.get("task_id")
         else:
@@ -68,28 +111,27 @@ def test_task_status(task_id):
     """
     Testa consulta de status da tarefa
     """
-    print("\n🧪 TESTE 2: Consulta de Status da Tarefa")
-    print("=" * 50)
+    _LOG("\n🧪 TESTE 2: Consulta de Status da Tarefa\n" + "=" * 50)
 
     if not task_id:
         print("❌ Task ID não disponível para consulta")
         return
 
     try:
-        print(f"📤 Consultando status da tarefa: {task_id}")
+        _LOG("📤 Consultando status da tarefa: %s", task_id)
 
         # Fazer GET para consultar status
-        response = requests.get(f"{API_BASE_URL}/scraping/{task_id}", timeout=30)
+        response = SESSION.get(f"{SCRAPING_URL}/{task_id}", timeout=30)
 
-        print(f"📊 Status Code: {response.status_code}")
+        _LOG("📊 Status Code: %s", response.status_code)
 
         if response.status_code == 200:
-            result = response.json()
-            print("✅ Status consultado com sucesso!")
-            print(f"🆔 Task ID: {result.get('task_id')}")
-            print(f"📝 Status: {result.get('status')}")
-            print(f"📊 Progresso: {result.get('progress', 0)}%")
-            print(f"💬 Mensagem: {result.get('message')}")
+            result = _json(response)
+            _LOG("✅ Status consultado com sucesso!")
+            _LOG("🆔 Task ID: %s", result.get("task_id"))
+            _LOG("📝 Status: %s", result.get("status"))
+            _LOG("📊 Progresso: %s%%", result.get("progress", 0))
+            _LOG("💬 Mensagem: %s", result.get("message"))
 
             return result
         else:
@@ -106,23 +148,22 @@ def test_api_health():
     """
     Testa endpoint de saúde da API
     """
-    print("\n🧪 TESTE 3: Verificação de Saúde da API")
-    print("=" * 50)
+    _LOG("\n🧪 TESTE 3: Verificação de Saúde da API\n" + "=" * 50)
 
     try:
-        print(f"📤 Consultando: {API_BASE_URL}/health")
+        _LOG("📤 Consultando: %s", HEALTH_URL)
 
-        response = requests.get(f"{API_BASE_URL}/health", timeout=10)
+        response = SESSION.get(HEALTH_URL, timeout=10)
 
-        print(f"📊 Status Code: {response.status_code}")
+        _LOG("📊 Status Code: %s", response.status_code)
 
         if response.status_code == 200:
-            result = response.json()
-            print("✅ API funcionando perfeitamente!")
-            print(f"📊 Status: {result.get('status')}")
-            print(f"🕐 Timestamp: {result.get('timestamp')}")
-            print(f"🔧 Serviço: {result.get('service')}")
-            print(f"📋 Fases: {result.get('phases', [])}")
+            result = _json(response)
+            _LOG("✅ API funcionando perfeitamente!")
+            _LOG("📊 Status: %s", result.get("status"))
+            _LOG("🕐 Timestamp: %s", result.get("timestamp"))
+            _LOG("🔧 Serviço: %s", result.get("service"))
+            _LOG("📋 Fases: %s", result.get("phases", []))
         else:
             print(f"❌ API com problemas: {response.status_code}")
 
@@ -134,23 +175,22 @@ def test_api_root():
     """
     Testa endpoint raiz da API
     """
-    print("\n🧪 TESTE 4: Endpoint Raiz da API")
-    print("=" * 50)
+    _LOG("\n🧪 TESTE 4: Endpoint Raiz da API\n" + "=" * 50)
 
     try:
-        print(f"📤 Consultando: {API_BASE_URL}/")
+        _LOG("📤 Consultando: %s", ROOT_URL)
 
-        response = requests.get(f"{API_BASE_URL}/", timeout=10)
+        response = SESSION.get(ROOT_URL, timeout=10)
 
-        print(f"📊 Status Code: {response.status_code}")
+        _LOG("📊 Status Code: %s", response.status_code)
 
         if response.status_code == 200:
-            result = response.json()
-            print("✅ Endpoint raiz funcionando!")
-            print(f"📝 Mensagem: {result.get('message')}")
-            print(f"🔢 Versão: {result.get('version')}")
-            print(f"🔗 Endpoints: {result.get('endpoints', {})}")
-            print(f"✅ Tarefas Suportadas: {result.get('supported_tasks', {})}")
+            result = _json(response)
+            _LOG("✅ Endpoint raiz funcionando!")
+            _LOG("📝 Mensagem: %s", result.get("message"))
+            _LOG("🔢 Versão: %s", result.get("version"))
+            _LOG("🔗 Endpoints: %s", result.get("endpoints", {}))
+            _LOG("✅ Tarefas Suportadas: %s", result.get("supported_tasks", {}))
         else:
             print(f"❌ Endpoint raiz com problemas: {response.status_code}")
 
@@ -162,64 +202,87 @@ def test_order_processing_simulation():
     """
     Simula o processamento de pedido para validação
     """
-    print("\n🧪 TESTE 5: Simulação de Processamento de Pedido")
-    print("=" * 50)
-
-    print("🔄 Simulando fluxo completo de pedido...")
-
-    # Simular tempo de processamento
-    print("⏳ Aguardando processamento...")
-    time.sleep(3)
-
-    print("✅ Simulação concluída!")
-    print("📋 Fluxo simulado:")
-    print("   1. Login no Servimed (simulado)")
-    print("   2. Busca de produtos (simulado)")
-    print("   3. Adição ao carrinho (simulado)")
-    print("   4. Finalização da compra (simulado)")
-    print("   5. Integração com API do desafio")
-    print("   6. Atualização via PATCH")
-    print("   7. Envio de callback")
+    _LOG("\n🧪 TESTE 5: Simulação de Processamento de Pedido\n" + "=" * 50)
+
+    _LOG("🔄 Simulando fluxo completo de pedido...")
+
+    # Simular tempo de processamento (apenas com SIMULATE_DELAY=1)
+    if os.environ.get("SIMULATE_DELAY") == "1":
+        _LOG("⏳ Aguardando processamento...")
+        time.sleep(3)
+
+    _LOG(
+        "\n".join(
+            [
+                "✅ Simulação concluída!",
+                "📋 Fluxo simulado:",
+                "   1. Login no Servimed (simulado)",
+                "   2. Busca de produtos (simulado)",
+                "   3. Adição ao carrinho (simulado)",
+                "   4. Finalização da compra (simulado)",
+                "   5. Integração com API do desafio",
+                "   6. Atualização via PATCH",
+                "   7. Envio de callback",
+            ]
+        )
+    )
 
 
 def run_complete_test():
     """
-    Executa todos os testes em sequência
+    Executa todos os testes (independentes em paralelo)
     """
-    print("🚀 INICIANDO TESTES COMPLETOS DA FASE 3")
-    print("=" * 60)
-    print(f"🕐 Início: {datetime.now().strftime('%H:%M:%S')}")
-    print(f"🌐 API Base: {API_BASE_URL}")
-    print(f"📞 Callback: {CALLBACK_URL}")
-    print("=" * 60)
+    start = time.monotonic()
+    _LOG(
+        "\n".join(
+            [
+                "🚀 INICIANDO TESTES COMPLETOS DA FASE 3",
+                "=" * 60,
+                "🕐 Início: %s",
+                "🌐 API Base: %s",
+                "📞 Callback: %s",
+                "=" * 60,
+            ]
+        ),
+        time.strftime("%H:%M:%S"),
+        API_BASE_URL,
+        CALLBACK_URL,
+    )
+
+    # Testes 3, 4 e 5 são independentes: executar em paralelo ao fluxo do pedido
+    independent_tests = [test_api_health, test_api_root, test_order_processing_simulation]
+    original_stdout = sys.stdout
+    sys.stdout = _ThreadLocalStdout(original_stdout)
 
-    # Teste 1: Criação de pedido
-    task_id = test_order_creation()
-
-    # Teste 2: Consulta de status
-    if task_id:
-        test_task_status(task_id)
+    try:
+        with ThreadPoolExecutor(max_workers=len(independent_tests)) as executor:
+            futures = [executor.submit(_run_buffered, test) for test in independent_tests]
 
-        # Aguardar um pouco para processamento
-        print("\n⏳ Aguardando 5 segundos para processamento...")
-        time.sleep(5)
+            # Teste 1: Criação de pedido
+            task_id = test_order_creation()
 
-        # Consultar status novamente
-        test_task_status(task_id)
+            # Teste 2: Consulta de status
+            if task_id:
+                test_task_status(task_id)
 
-    # Teste 3: Saúde da API
-    test_api_health()
+                # Aguardar um pouco para processamento
+                _LOG("\n⏳ Aguardando 5 segundos para processamento...")
+                time.sleep(5)
 
-    # Teste 4: Endpoint raiz
-    test_api_root()
+                # Consultar status novamente
+                test_task_status(task_id)
 
-    # Teste 5: Simulação de processamento
-    test_order_processing_simulation()
+            # Saída dos testes 3, 4 e 5 na ordem original
+            for future in futures:
+                print(future.result(), end="")
+    finally:
+        sys.stdout = original_stdout
 
-    print("\n" + "=" * 60)
+    _LOG("\n" + "=" * 60)
     print("🏁 TESTES COMPLETOS DA FASE 3 FINALIZADOS!")
-    print(f"🕐 Fim: {datetime.now().strftime('%H:%M:%S')}")
-    print("=" * 60)
+    print(f"🕐 Fim: {time.strftime('%H:%M:%S')}")
+    print(f"⏱️ Duração: {time.monotonic() - start:.1f}s")
+    _LOG("=" * 60)
 
 
 if __name__ == "__main__":
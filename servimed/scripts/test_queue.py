@@ -9,27 +9,35 @@ python test_queue.py
 """
 
 import requests
-import json
+import sys
 import time
 import os
 from typing import Dict, Any
 
-import sys
-
-sys.path.append(os.path.join(os.path.dirname(__file__), ".."))
-
+from helpers import (
+    JSON_HEADERS,
+    SESSION,
+    dumps_bytes as _dumps,
+    log as _LOG,
+    parse_json as _json,
+    poll_delays as _poll_delays,
+    wait_for_celery_result as _wait_for_celery_result,
+)
 from servimed.config import get_config
 
+# URLs da API resolvidas uma única vez
+API_BASE_URL = "http://localhost:8000"
+SCRAPING_URL = f"{API_BASE_URL}/scraping"
 
 
 def get_credentials_from_env() -> Dict[str, str]:
     """Obtém credenciais das variáveis de ambiente."""
 
-    print("Carregando configurações...")
+    _LOG("Carregando configurações...")
 
     try:
         config = get_config()
-        print("Configuração carregada com sucesso")
+        _LOG("Configuração carregada com sucesso")
 
         return {
             "usuario": config.servimed_credentials["username"],
@@ -39,7 +47,7 @@ def get_credentials_from_env() -> Dict[str, str]:
 
     except Exception as e:
         print(f"Erro ao carregar configuração: {e}")
-        print("Usando variáveis de ambiente diretas...")
+        _LOG("Usando variáveis de ambiente diretas...")
 
         # Fallback para variáveis de ambiente
         username = os.getenv("SERVIMED_USERNAME", "juliano@farmaprevonline.com.br")
@@ -54,22 +62,21 @@ def get_credentials_from_env() -> Dict[str, str]:
 def test_scraping_queue() -> None:
     """Testa a fila de scraping criando uma tarefa e monitorando o progresso."""
 
-    print("TESTANDO FILA DE SCRAPING")
-    print("=" * 50)
+    _LOG("TESTANDO FILA DE SCRAPING\n" + "=" * 50)
 
     task_data = get_credentials_from_env()
 
-    print(f"Enviando tarefa para a fila...")
-    print(f"Usuario: {task_data['usuario']}")
-    print(f"Callback URL: {task_data['callback_url']}")
-    print()
+    _LOG("Enviando tarefa para a fila...")
+    _LOG("Usuario: %s", task_data["usuario"])
+    _LOG("Callback URL: %s", task_data["callback_url"])
+    _LOG()
 
     try:
         # Criar tarefa na fila
-        response = requests.post(
-            f"http://localhost:8000/scraping",
-            json=task_data,
-            headers={"Content-Type": "application/json"},
+        response = SESSION.post(
+            SCRAPING_URL,
+            data=_dumps(task_data),
+            headers=JSON_HEADERS,
         )
 
         if response.status_code != 200:
@@ -78,41 +85,54 @@ def test_scraping_queue() -> None:
             return
 
         # Extrair informações da resposta
-        task_info = response.json()
+        task_info = _json(response)
         task_id = task_info["task_id"]
+        status_url = f"{SCRAPING_URL}/{task_id}"
 
-        print(f"Tarefa criada com sucesso!")
-        print(f"Task ID: {task_id}")
-        print(f"Status: {task_info['status']}")
-        print()
+        _LOG("Tarefa criada com sucesso!")
+        _LOG("Task ID: %s", task_id)
+        _LOG("Status: %s", task_info["status"])
+        _LOG()
 
         # Monitorar progresso da tarefa
-        print("Monitorando progresso da tarefa...")
-        print("-" * 30)
+        _LOG("Monitorando progresso da tarefa...\n" + "-" * 30)
 
-        max_attempts = 30
+        max_wait = 300
+        deadline = time.monotonic() + max_wait
+        if _wait_for_celery_result(task_id, max_wait) == "timeout":
+            deadline = time.monotonic()
+
+        # Após o aguardo no Celery, a primeira consulta já traz o estado final
+        delays = _poll_delays()
+        last_status = None
         attempt = 0
 
-        while attempt < max_attempts:
+        while time.monotonic() < deadline:
             attempt += 1
 
             # Verificar status da tarefa
-            status_response = requests.get(f"http://localhost:8000/scraping/{task_id}")
+            status_response = SESSION.get(status_url)
 
             if status_response.status_code != 200:
                 print(f"Erro ao verificar status: {status_response.status_code}")
+                time.sleep(next(delays))
                 continue
 
-            task_status = status_response.json()
+            task_status = _json(status_response)
             current_status = task_status["status"]
 
-            print(f"Tentativa {attempt:2d}: Status = {current_status}")
+            _LOG("Tentativa %2d: Status = %s", attempt, current_status)
+
+            # Mudança de estado: reiniciar backoff
+            if current_status != last_status:
+                delays = _poll_delays()
+                last_status = current_status
 
             # Tarefa concluída
             if current_status == "completed":
-                print()
+                _LOG()
                 print("TAREFA CONCLUÍDA COM SUCESSO!")
-                print("=" * 50)
+                _LOG("=" * 50)
 
                 # Mostrar resultados
                 result = task_status.get("result", {})
@@ -128,36 +148,39 @@ def test_scraping_queue() -> None:
                 # Mostrar alguns produtos de exemplo
                 products = result.get("products", [])
                 if products:
-                    print(f"\nExemplos de produtos:")
+                    lines = ["\nExemplos de produtos:\n"]
                     for i, product in enumerate(products[:3]):
-                        print(f"{i+1}. {product['descricao'][:50]}...")
-                        print(f"   GTIN: {product['gtin']}")
-                        print(f"   Preço: R$ {product['preco_fabrica']:.2f}")
-                        print(f"   Estoque: {product['estoque']}")
-                        print()
+                        lines.append(
+                            f"{i+1}. {product['descricao'][:50]}...\n"
+                            f"   GTIN: {product['gtin']}\n"
+                            f"   Preço: R$ {product['preco_fabrica']:.2f}\n"
+                            f"   Estoque: {product['estoque']}\n\n"
+                        )
+                    # Uma única escrita no stdout
+                    sys.stdout.write("".join(lines))
 
                 break
 
             # Tarefa falhou
             elif current_status == "failed":
-                print()
+                _LOG()
                 print("TAREFA FALHOU!")
-                print("=" * 50)
+                _LOG("=" * 50)
                 error = task_status.get("error", "Erro desconhecido")
                 print(f"Erro: {error}")
                 break
 
-            # Aguardar antes da próxima verificação
-            time.sleep(10)
+            # Aguardar antes da próxima verificação (backoff exponencial)
+            time.sleep(next(delays))
 
         else:
-            print()
+            _LOG()
             print("Tempo limite excedido. A tarefa ainda está em processamento.")
-            print(f"Verifique manualmente: http://localhost:8000/scraping/{task_id}")
+            print(f"Verifique manualmente: {status_url}")
 
     except requests.exceptions.ConnectionError:
         print(
-            "Erro de conexão: Verifique se a API está rodando em http://localhost:8000"
+            f"Erro de conexão: Verifique se a API está rodando em {API_BASE_URL}"
         )
     except Exception as e:
         print(f"Erro inesperado: {e}")
@@ -2,23 +2,44 @@
 Este script testa todo o fluxo: API -> Celery -> Workers -> Resultado.
 """
 
-import requests
 import time
-import json
 from datetime import datetime
 
+from helpers import (
+    JSON_HEADERS,
+    SESSION,
+    dumps_bytes as _dumps,
+    log as _LOG,
+    parse_json as _json,
+    poll_delays as _poll_delays,
+    wait_for_celery_result as _wait_for_celery_result,
+)
+
+# URLs da API resolvidas uma única vez
+API_BASE_URL = "http://localhost:8000"
+SCRAPING_URL = f"{API_BASE_URL}/scraping"
+HEALTH_URL = f"{API_BASE_URL}/health"
+
+# Dados de teste (corpo serializado uma única vez)
+TASK_DATA = {
+    "usuario": "teste@servimed.com",
+    "senha": "senha123",
+    "callback_url": "https://httpbin.org/post",
+}
+TASK_BODY = _dumps(TASK_DATA)
+
 
 def test_api_health():
     """Testa se a API está funcionando."""
     try:
-        print("🔍 Testando saúde da API...")
-        response = requests.get("http://localhost:8000/health")
+        _LOG("🔍 Testando saúde da API...")
+        response = SESSION.get(HEALTH_URL)
 
         if response.status_code == 200:
-            data = response.json()
-            print("✅ API funcionando!")
-            print(f"📊 Status: {data.get('status')}")
-            print(f"🕐 Timestamp: {data.get('timestamp')}")
+            data = _json(response)
+            _LOG("✅ API funcionando!")
+            _LOG("📊 Status: %s", data.get("status"))
+            _LOG("🕐 Timestamp: %s", data.get("timestamp"))
             return True
         else:
             print(f"❌ API não respondeu: Status {response.status_code}")
@@ -32,24 +53,19 @@ def test_api_health():
 def test_create_task():
     """Testa criação de tarefa de scraping."""
     try:
-        print("\n📝 Testando criação de tarefa...")
-
-        # Dados de teste
-        task_data = {
-            "usuario": "teste@servimed.com",
-            "senha": "senha123",
-            "callback_url": "https://httpbin.org/post",
-        }
+        _LOG("\n📝 Testando criação de tarefa...")
 
-        # Criar tarefa
-        response = requests.post("http://localhost:8000/scraping", json=task_data)
+        # Criar tarefa (corpo pré-serializado)
+        response = SESSION.post(
+            SCRAPING_URL, data=TASK_BODY, headers=JSON_HEADERS
+        )
 
         if response.status_code == 200:
-            data = response.json()
-            print(" Tarefa criada com sucesso!")
-            print(f" Task ID: {data.get('task_id')}")
-            print(f" Status: {data.get('status')}")
-            print(f" Mensagem: {data.get('message')}")
+            data = _json(response)
+            _LOG(" Tarefa criada com sucesso!")
+            _LOG(" Task ID: %s", data.get("task_id"))
+            _LOG(" Status: %s", data.get("status"))
+            _LOG(" Mensagem: %s", data.get("message"))
             return data.get("task_id")
         else:
             print(f" Erro ao criar tarefa: Status {response.status_code}")
@@ -64,17 +80,17 @@ def test_create_task():
 def test_task_status(task_id):
     """Testa consulta de status da tarefa."""
     try:
-        print(f"\n Testando status da tarefa {task_id}...")
+        _LOG("\n Testando status da tarefa %s...", task_id)
 
         # Consultar status
-        response = requests.get(f"http://localhost:8000/scraping/{task_id}")
+        response = SESSION.get(f"{SCRAPING_URL}/{task_id}")
 
         if response.status_code == 200:
-            data = response.json()
-            print(" Status consultado com sucesso!")
-            print(f" Status: {data.get('status')}")
-            print(f" Progresso: {data.get('progress', 0):.1%}")
-            print(f" Mensagem: {data.get('message')}")
+            data = _json(response)
+            _LOG(" Status consultado com sucesso!")
+            _LOG(" Status: %s", data.get("status"))
+            _LOG(" Progresso: %.1f%%", data.get("progress", 0) * 100)
+            _LOG(" Mensagem: %s", data.get("message"))
             return data.get("status")
         else:
             print(f" Erro ao consultar status: Status {response.status_code}")
@@ -87,14 +103,25 @@ def test_task_status(task_id):
 
 def monitor_task_progress(task_id, max_wait=60):
     """Monitora o progresso da tarefa."""
-    print(f"\n Monitorando progresso da tarefa {task_id}...")
-    print(" Aguardando processamento...")
+    _LOG("\n Monitorando progresso da tarefa %s...", task_id)
+    _LOG(" Aguardando processamento...")
+
+    deadline = time.monotonic() + max_wait
+    if _wait_for_celery_result(task_id, max_wait) == "timeout":
+        deadline = time.monotonic()
 
-    start_time = time.time()
+    # Após o aguardo no Celery, a primeira consulta já traz o estado final
+    delays = _poll_delays()
+    last_status = None
 
-    while time.time() - start_time < max_wait:
+    while time.monotonic() < deadline:
         status = test_task_status(task_id)
 
+        # Mudança de estado: reiniciar backoff
+        if status != last_status:
+            delays = _poll_delays()
+            last_status = status
+
         if status == "completed":
             print(" TAREFA CONCLUÍDA COM SUCESSO!")
             return True
@@ -102,11 +129,11 @@ def monitor_task_progress(task_id, max_wait=60):
             print(" TAREFA FALHOU!")
             return False
         elif status in ["pending", "processing"]:
-            print(" Aguardando...")
-            time.sleep(5)
+            _LOG(" Aguardando...")
+            time.sleep(next(delays))
         else:
-            print(f" Status desconhecido: {status}")
-            time.sleep(5)
+            _LOG(" Status desconhecido: %s", status)
+            time.sleep(next(delays))
 
     print(" Tempo limite excedido")
     return False
@@ -114,15 +141,20 @@ def monitor_task_progress(task_id, max_wait=60):
 
 def main():
     """Função principal de teste."""
-    print("=" * 60)
-    print(" TESTE DO SISTEMA COMPLETO - FASE 2")
-    print("=" * 60)
-
-    print(" Pré-requisitos:")
-    print("    Redis rodando (localhost:6379)")
-    print("    Workers Celery ativos")
-    print("    API FastAPI rodando (localhost:8000)")
-    print("=" * 60)
+    _LOG(
+        "\n".join(
+            [
+                "=" * 60,
+                " TESTE DO SISTEMA COMPLETO - FASE 2",
+                "=" * 60,
+                " Pré-requisitos:",
+                "    Redis rodando (localhost:6379)",
+                "    Workers Celery ativos",
+                "    API FastAPI rodando (localhost:8000)",
+                "=" * 60,
+            ]
+        )
+    )
 
     # Teste 1: Saúde da API
     if not test_api_health():
@@ -139,14 +171,14 @@ def main():
     success = monitor_task_progress(task_id)
 
     # Resultado final
-    print("\n" + "=" * 60)
+    _LOG("\n" + "=" * 60)
     if success:
         print(" SISTEMA FUNCIONANDO PERFEITAMENTE!")
         print(" Fase 2 validada com sucesso!")
     else:
         print(" SISTEMA COM PROBLEMAS")
         print(" Verifique logs e configurações")
-    print("=" * 60)
+    _LOG("=" * 60)
 
 
 if __name__ == "__main__":
@@ -7,15 +7,18 @@ variáveis de ambiente e validando configurações obrigatórias.
 
 import os
 import logging
-from typing import Optional, Dict, Any
-from dataclasses import dataclass
+from functools import cached_property
+from typing import Optional, Dict, Any, Mapping
+from dataclasses import asdict, dataclass
 from pathlib import Path
 from dotenv import load_dotenv
 
-# Configurar logging
-logging.basicConfig(level=logging.INFO)
+# Logger do módulo (handlers configurados em Config._setup_logging)
 logger = logging.getLogger(__name__)
 
+# Indica se o arquivo .env já foi carregado neste processo
+_ENV_LOADED = False
+
 
 class ConfigurationError(Exception):
     """Exceção personalizada para erros de configuração."""
@@ -23,7 +26,7 @@ class ConfigurationError(Exception):
     pass
 
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class OAuth2Config:
     """Configurações OAuth2 para autenticação na API."""
     username: str
@@ -34,19 +37,20 @@ class OAuth2Config:
     scope: str
 
     @classmethod
-    def from_env(cls) -> "OAuth2Config":
-        """Cria instância a partir de variáveis de ambiente."""
+    def from_env(cls, env: Optional[Mapping[str, str]] = None) -> "OAuth2Config":
+        """Cria instância a partir de variáveis de ambiente (ou de um snapshot)."""
+        env = os.environ if env is None else env
         return cls(
-            username=os.getenv("SERVIMED_USERNAME", "string"),
-            password=os.getenv("SERVIMED_PASSWORD", "********"),
-            client_id=os.getenv("OAUTH2_CLIENT_ID", "string"),
-            client_secret=os.getenv("OAUTH2_CLIENT_SECRET", "********"),
-            grant_type=os.getenv("OAUTH2_GRANT_TYPE", "password"),
-            scope=os.getenv("OAUTH2_SCOPE", ""),
+            username=env.get("SERVIMED_USERNAME", "string"),
+            password=env.get("SERVIMED_PASSWORD", "********"),
+            client_id=env.get("OAUTH2_CLIENT_ID", "string"),
+            client_secret=env.get("OAUTH2_CLIENT_SECRET", "********"),
+            grant_type=env.get("OAUTH2_GRANT_TYPE", "password"),
+            scope=env.get("OAUTH2_SCOPE", ""),
         )
 
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class APIConfig:
     """Configurações da API de callback."""
 
@@ -54,19 +58,26 @@ class APIConfig:
     signup_endpoint: str
     token_endpoint: str
     products_endpoint: str
+    callback_chunk_size: int
+    callback_gzip: bool
 
     @classmethod
-    def from_env(cls) -> "APIConfig":
-        """Cria instância a partir de variáveis de ambiente."""
+    def from_env(cls, env: Optional[Mapping[str, str]] = None) -> "APIConfig":
+        """Cria instância a partir de variáveis de ambiente (ou de um snapshot)."""
+        env = os.environ if env is None else env
         return cls(
-            base_url=os.getenv("CALLBACK_API_BASE_URL", ""),
-            signup_endpoint=os.getenv("CALLBACK_API_SIGNUP_ENDPOINT", ""),
-            token_endpoint=os.getenv("CALLBACK_API_TOKEN_ENDPOINT", ""),
-            products_endpoint=os.getenv("CALLBACK_API_PRODUCTS_ENDPOINT", ""),
+            base_url=env.get("CALLBACK_API_BASE_URL", ""),
+            signup_endpoint=env.get("CALLBACK_API_SIGNUP_ENDPOINT", ""),
+            token_endpoint=env.get("CALLBACK_API_TOKEN_ENDPOINT", ""),
+            products_endpoint=env.get("CALLBACK_API_PRODUCTS_ENDPOINT", ""),
+            # 0 envia todos os produtos em um único POST
+            callback_chunk_size=int(env.get("CALLBACK_CHUNK_SIZE", "0")),
+            # Comprimir o corpo do callback (o servidor precisa aceitar gzip)
+            callback_gzip=env.get("CALLBACK_GZIP", "false").lower() == "true",
         )
 
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class ScrapyConfig:
     """Configurações do Scrapy."""
 
@@ -76,17 +87,18 @@ class ScrapyConfig:
     download_timeout: int
 
     @classmethod
-    def from_env(cls) -> "ScrapyConfig":
-        """Cria instância a partir de variáveis de ambiente."""
+    def from_env(cls, env: Optional[Mapping[str, str]] = None) -> "ScrapyConfig":
+        """Cria instância a partir de variáveis de ambiente (ou de um snapshot)."""
+        env = os.environ if env is None else env
         return cls(
-            log_level=os.getenv("SCRAPY_LOG_LEVEL", "INFO"),
-            download_delay=int(os.getenv("SCRAPY_DOWNLOAD_DELAY", "1")),
-            concurrent_requests=int(os.getenv("SCRAPY_CONCURRENT_REQUESTS", "16")),
-            download_timeout=int(os.getenv("SCRAPY_DOWNLOAD_TIMEOUT", "30")),
+            log_level=env.get("SCRAPY_LOG_LEVEL", "INFO"),
+            download_delay=int(env.get("SCRAPY_DOWNLOAD_DELAY", "1")),
+            concurrent_requests=int(env.get("SCRAPY_CONCURRENT_REQUESTS", "16")),
+            download_timeout=int(env.get("SCRAPY_DOWNLOAD_TIMEOUT", "30")),
         )
 
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class OutputConfig:
     """Configurações de saída e armazenamento."""
 
@@ -94,15 +106,16 @@ class OutputConfig:
     filename_prefix: str
 
     @classmethod
-    def from_env(cls) -> "OutputConfig":
-        """Cria instância a partir de variáveis de ambiente."""
+    def from_env(cls, env: Optional[Mapping[str, str]] = None) -> "OutputConfig":
+        """Cria instância a partir de variáveis de ambiente (ou de um snapshot)."""
+        env = os.environ if env is None else env
         return cls(
-            directory=os.getenv("OUTPUT_DIRECTORY", "dados_servimed"),
-            filename_prefix=os.getenv("OUTPUT_FILENAME_PREFIX", "produtos_servimed"),
+            directory=env.get("OUTPUT_DIRECTORY", "dados_servimed"),
+            filename_prefix=env.get("OUTPUT_FILENAME_PREFIX", "produtos_servimed"),
         )
 
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class LogConfig:
     """Configurações de logging."""
 
@@ -111,16 +124,17 @@ class LogConfig:
     file: str
 
     @classmethod
-    def from_env(cls) -> "LogConfig":
-        """Cria instância a partir de variáveis de ambiente."""
+    def from_env(cls, env: Optional[Mapping[str, str]] = None) -> "LogConfig":
+        """Cria instância a partir de variáveis de ambiente (ou de um snapshot)."""
+        env = os.environ if env is None else env
         return cls(
-            level=os.getenv("LOG_LEVEL", "INFO"),
-            format=os.getenv("LOG_FORMAT", "json"),
-            file=os.getenv("LOG_FILE", "logs/servimed.log"),
+            level=env.get("LOG_LEVEL", "INFO"),
+            format=env.get("LOG_FORMAT", "json"),
+            file=env.get("LOG_FILE", "logs/servimed.log"),
         )
 
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class CacheConfig:
     """Configurações de cache."""
 
@@ -128,15 +142,16 @@ class CacheConfig:
     ttl: int
 
     @classmethod
-    def from_env(cls) -> "CacheConfig":
-        """Cria instância a partir de variáveis de ambiente."""
+    def from_env(cls, env: Optional[Mapping[str, str]] = None) -> "CacheConfig":
+        """Cria instância a partir de variáveis de ambiente (ou de um snapshot)."""
+        env = os.environ if env is None else env
         return cls(
-            enabled=os.getenv("CACHE_ENABLED", "true").lower() == "true",
-            ttl=int(os.getenv("CACHE_TTL", "1800")),
+            enabled=env.get("CACHE_ENABLED", "true").lower() == "true",
+            ttl=int(env.get("CACHE_TTL", "1800")),
         )
 
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class RetryConfig:
     """Configurações de retry."""
 
@@ -144,11 +159,12 @@ class RetryConfig:
     delay: int
 
     @classmethod
-    def from_env(cls) -> "RetryConfig":
-        """Cria instância a partir de variáveis de ambiente."""
+    def from_env(cls, env: Optional[Mapping[str, str]] = None) -> "RetryConfig":
+        """Cria instância a partir de variáveis de ambiente (ou de um snapshot)."""
+        env = os.environ if env is None else env
         return cls(
-            max_attempts=int(os.getenv("MAX_RETRY_ATTEMPTS", "3")),
-            delay=int(os.getenv("RETRY_DELAY", "5")),
+            max_attempts=int(env.get("MAX_RETRY_ATTEMPTS", "3")),
+            delay=int(env.get("RETRY_DELAY", "5")),
         )
 
 
@@ -165,19 +181,30 @@ class Config:
         self._validate_configuration()
         self._setup_logging()
 
+        # Base da API e URLs de endpoints montadas (conjunto pequeno e fixo)
+        self._api_base = self.api.base_url.rstrip("/")
+        self._url_cache: Dict[str, str] = {}
+
     def _load_environment(self) -> None:
         """Carrega variáveis de ambiente do arquivo .env."""
+        global _ENV_LOADED
         try:
-            # Tentar carregar do arquivo .env na raiz do projeto
-            env_path = Path(__file__).parent.parent / ".env"
-            if env_path.exists():
-                load_dotenv(env_path)
-                logger.info("Arquivo .env carregado com sucesso")
-            else:
-                logger.warning(
-                    "Arquivo .env não encontrado, usando variáveis do sistema"
-                )
-                load_dotenv()
+            # O .env é lido uma única vez por processo
+            if not _ENV_LOADED:
+                # Tentar carregar do arquivo .env na raiz do projeto
+                env_path = Path(__file__).parent.parent / ".env"
+                if env_path.exists():
+                    load_dotenv(env_path)
+                    logger.info("Arquivo .env carregado com sucesso")
+                else:
+                    logger.warning(
+                        "Arquivo .env não encontrado, usando variáveis do sistema"
+                    )
+                    load_dotenv()
+                _ENV_LOADED = True
+
+            # Snapshot do ambiente: leituras posteriores não consultam os.environ
+            self._env: Dict[str, str] = dict(os.environ)
         except Exception as e:
             logger.error(f"Erro ao carregar arquivo .env: {e}")
             raise ConfigurationError(f"Falha ao carregar configurações: {e}")
@@ -190,7 +217,7 @@ class Config:
             "CALLBACK_API_BASE_URL",
         ]
 
-        missing_vars = [var for var in required_vars if not os.getenv(var)]
+        missing_vars = [var for var in required_vars if not self._env.get(var)]
 
         if missing_vars:
             error_msg = f"Variáveis de ambiente obrigatórias não encontradas: {', '.join(missing_vars)}"
@@ -223,53 +250,58 @@ class Config:
         file_handler.setFormatter(formatter)
         console_handler.setFormatter(formatter)
 
+        # Remover handlers de instâncias anteriores (evita mensagens duplicadas)
+        for handler in logger.handlers[:]:
+            logger.removeHandler(handler)
+            handler.close()
+
         # Aplicar configurações
         logger.addHandler(file_handler)
         logger.addHandler(console_handler)
         logger.setLevel(log_level)
 
-    @property
+    @cached_property
     def servimed_credentials(self) -> Dict[str, str]:
         """Retorna credenciais do Servimed."""
         return {
-            "username": os.getenv("SERVIMED_USERNAME"),
-            "password": os.getenv("SERVIMED_PASSWORD"),
+            "username": self._env.get("SERVIMED_USERNAME"),
+            "password": self._env.get("SERVIMED_PASSWORD"),
         }
 
-    @property
+    @cached_property
     def oauth2(self) -> OAuth2Config:
         """Retorna configurações OAuth2."""
-        return OAuth2Config.from_env()
+        return OAuth2Config.from_env(self._env)
 
-    @property
+    @cached_property
     def api(self) -> APIConfig:
         """Retorna configurações da API."""
-        return APIConfig.from_env()
+        return APIConfig.from_env(self._env)
 
-    @property
+    @cached_property
     def scrapy(self) -> ScrapyConfig:
         """Retorna configurações do Scrapy."""
-        return ScrapyConfig.from_env()
+        return ScrapyConfig.from_env(self._env)
 
-    @property
+    @cached_property
     def output(self) -> OutputConfig:
         """Retorna configurações de saída."""
-        return OutputConfig.from_env()
+        return OutputConfig.from_env(self._env)
 
-    @property
+    @cached_property
     def log(self) -> LogConfig:
         """Retorna configurações de logging."""
-        return LogConfig.from_env()
+        return LogConfig.from_env(self._env)
 
-    @property
+    @cached_property
     def cache(self) -> CacheConfig:
         """Retorna configurações de cache."""
-        return CacheConfig.from_env()
+        return CacheConfig.from_env(self._env)
 
-    @property
+    @cached_property
     def retry(self) -> RetryConfig:
         """Retorna configurações de retry."""
-        return RetryConfig.from_env()
+        return RetryConfig.from_env(self._env)
 
     def get_full_url(self, endpoint: str) -> str:
         """
@@ -281,21 +313,23 @@ class Config:
         Returns:
             URL completa (ex: https://desafio.cotefacil.net/oauth/token)
         """
-        base_url = self.api.base_url.rstrip("/")
-        endpoint = endpoint.lstrip("/")
-        return f"{base_url}/{endpoint}"
+        url = self._url_cache.get(endpoint)
+        if url is None:
+            url = self._url_cache[endpoint] = self._api_base + "/" + endpoint.lstrip("/")
+        return url
 
     def to_dict(self) -> Dict[str, Any]:
         """Converte configurações para dicionário (para debug)."""
         return {
-            "servimed_credentials": self.servimed_credentials,
-            "oauth2": self.oauth2.__dict__,
-            "api": self.api.__dict__,
-            "scrapy": self.scrapy.__dict__,
-            "output": self.output.__dict__,
-            "log": self.log.__dict__,
-            "cache": self.cache.__dict__,
-            "retry": self.retry.__dict__,
+            # Cópia: o dicionário em cache não deve ser alterado por quem chama
+            "servimed_credentials": dict(self.servimed_credentials),
+            "oauth2": asdict(self.oauth2),
+            "api": asdict(self.api),
+            "scrapy": asdict(self.scrapy),
+            "output": asdict(self.output),
+            "log": asdict(self.log),
+            "cache": asdict(self.cache),
+            "retry": asdict(self.retry),
         }
 
     def __str__(self) -> str:
@@ -307,19 +341,23 @@ class Config:
         return f"Config(api_base_url={self.api.base_url}, output_dir={self.output.directory})"
 
 
-# Instância global de configuração
-config = Config()
+# Instância global de configuração (criada no primeiro acesso)
+_config: Optional[Config] = None
 
 
 # Função de conveniência para importação
 def get_config() -> Config:
-    """Retorna instância global de configuração."""
-    return config
+    """Retorna instância global de configuração, criando-a na primeira chamada."""
+    global _config
+    if _config is None:
+        _config = Config()
+    return _config
 
 
 if __name__ == "__main__":
     # Teste das configurações
     try:
+        config = get_config()
         print("=== CONFIGURAÇÕES CARREGADAS ===")
         print(f"API Base URL: {config.api.base_url}")
         print(f"Output Directory: {config.output.directory}")
@@ -2,8 +2,12 @@
 Modelos de dados para autenticação OAuth2.
 """
 
+import re
 from typing import Optional
-from pydantic import BaseModel, Field, validator
+from pydantic import BaseModel, ConfigDict, Field, ValidationInfo, field_validator
+
+# Formato básico de email (pré-compilado)
+_EMAIL_RE = re.compile(r"^[^@\s]+@[^@\s]+\.[^@\s]+$")
 
 
 class AuthCredentials(BaseModel):
@@ -11,14 +15,21 @@ class AuthCredentials(BaseModel):
     username: str = Field(..., description="Email do usuário")
     password: str = Field(..., description="Senha do usuário")
 
-    @validator("username")
+    @field_validator("username")
+    @classmethod
     def validate_username(cls, v):
         """Valida formato básico do email."""
-        if not v or "@" not in v:
+        # strip() devolve o próprio objeto quando não há espaços; lower() só
+        # é aplicado se o valor ainda não estiver normalizado
+        username = v.strip()
+        if not username.islower():
+            username = username.lower()
+        if not _EMAIL_RE.match(username):
             raise ValueError("Username deve ser um email válido")
-        return v.strip().lower()
+        return username
 
-    @validator("password")
+    @field_validator("password")
+    @classmethod
     def validate_password(cls, v):
         """Valida que a senha não esteja vazia."""
         if not v or len(v.strip()) < 1:
@@ -41,21 +52,24 @@ class AuthToken(BaseModel):
     access_token: str = Field(..., description="Token de acesso JWT")
     expires_in: int = Field(..., description="Tempo de expiração em segundos")
 
-    @validator("token_type")
+    @field_validator("token_type")
+    @classmethod
     def validate_token_type(cls, v):
         """Valida tipo do token."""
         if v.lower() != "bearer":
             raise ValueError("Tipo de token deve ser Bearer")
         return v
 
-    @validator("access_token")
+    @field_validator("access_token")
+    @classmethod
     def validate_access_token(cls, v):
         """Valida que o token não esteja vazio."""
         if not v or len(v.strip()) < 10:
             raise ValueError("Token de acesso inválido")
         return v.strip()
 
-    @validator("expires_in")
+    @field_validator("expires_in")
+    @classmethod
     def validate_expires_in(cls, v):
         """Valida tempo de expiração."""
         if v <= 0:
@@ -82,23 +96,22 @@ class AuthResponse(BaseModel):
     Pode conter token ou mensagem de erro.
     """
 
+    model_config = ConfigDict(frozen=True)
+
     success: bool = Field(..., description="Indica se a autenticação foi bem-sucedida")
     token: Optional[AuthToken] = Field(None, description="Token de acesso (se sucesso)")
     error: Optional[str] = Field(None, description="Mensagem de erro (se falha)")
 
-    @validator("error")
-    def validate_error(cls, v, values):
+    @field_validator("error")
+    @classmethod
+    def validate_error(cls, v, info: ValidationInfo):
         """Valida que erro existe apenas quando não há sucesso."""
-        if values.get("success") and v:
+        if info.data.get("success") and v:
             raise ValueError("Erro não deve existir quando autenticação é bem-sucedida")
-        if not values.get("success") and not v:
+        if not info.data.get("success") and not v:
             raise ValueError("Erro deve ser informado quando autenticação falha")
         return v
 
     def to_dict(self) -> dict:
         """Converte para dicionário."""
-        return {
-            "success": self.success,
-            "token": self.token.dict() if self.token else None,
-            "error": self.error,
-        }
+        return self.model_dump()
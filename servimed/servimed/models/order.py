@@ -4,7 +4,7 @@ Sistema de pedidos integrado ao scraping Servimed
 """
 
 from typing import List, Optional
-from pydantic import BaseModel, Field, validator
+from pydantic import BaseModel, ConfigDict, Field, field_validator
 from datetime import datetime
 
 
@@ -15,16 +15,18 @@ class ProductItem(BaseModel):
     codigo: str = Field(..., description="Código interno do produto")
     quantidade: int = Field(..., ge=1, description="Quantidade solicitada")
 
-    @validator("quantidade")
+    @field_validator("quantidade")
+    @classmethod
     def validate_quantidade(cls, v):
         if v < 1:
             raise ValueError("Quantidade deve ser maior que zero")
         return v
 
-    class Config:
-        schema_extra = {
+    model_config = ConfigDict(
+        json_schema_extra={
             "example": {"gtin": "7899095203136", "codigo": "446231", "quantidade": 1}
         }
+    )
 
 
 class OrderRequest(BaseModel):
@@ -34,18 +36,19 @@ class OrderRequest(BaseModel):
     senha: str = Field(..., description="Senha para login no Servimed")
     id_pedido: str = Field(..., description="Identificador único do pedido")
     produtos: List[ProductItem] = Field(
-        ..., min_items=1, description="Lista de produtos do pedido"
+        ..., min_length=1, description="Lista de produtos do pedido"
     )
     callback_url: str = Field(..., description="URL para callback da confirmação")
 
-    @validator("produtos")
+    @field_validator("produtos")
+    @classmethod
     def validate_produtos(cls, v):
         if not v:
             raise ValueError("Pedido deve ter pelo menos um produto")
         return v
 
-    class Config:
-        schema_extra = {
+    model_config = ConfigDict(
+        json_schema_extra={
             "example": {
                 "usuario": "fornecedor_user",
                 "senha": "fornecedor_pass",
@@ -56,6 +59,7 @@ class OrderRequest(BaseModel):
                 "callback_url": "https://desafio.cotefacil.net",
             }
         }
+    )
 
 
 class OrderResponse(BaseModel):
@@ -64,10 +68,12 @@ class OrderResponse(BaseModel):
     codigo_confirmacao: str = Field(..., description="Código de confirmação do pedido")
     status: str = Field(..., description="Status do pedido")
 
-    class Config:
-        schema_extra = {
+    model_config = ConfigDict(
+        frozen=True,
+        json_schema_extra={
             "example": {"codigo_confirmacao": "ABC987", "status": "pedido_realizado"}
-        }
+        },
+    )
 
 
 class Order(BaseModel):
@@ -78,8 +84,8 @@ class Order(BaseModel):
     status: Optional[str] = Field(None, description="Status atual do pedido")
     itens: List[ProductItem] = Field(..., description="Itens do pedido")
 
-    class Config:
-        schema_extra = {
+    model_config = ConfigDict(
+        json_schema_extra={
             "example": {
                 "id": 64,
                 "codigo_fornecedor": None,
@@ -89,6 +95,7 @@ class Order(BaseModel):
                 ],
             }
         }
+    )
 
 
 class OrderStatus(BaseModel):
@@ -112,8 +119,8 @@ class OrderStatus(BaseModel):
         None, description="Resultado do processamento"
     )
 
-    class Config:
-        schema_extra = {
+    model_config = ConfigDict(
+        json_schema_extra={
             "example": {
                 "task_id": "e6a0e772-78fc-4ed9-96ba-4b6019b3e532",
                 "status": "completed",
@@ -129,6 +136,7 @@ class OrderStatus(BaseModel):
                 },
             }
         }
+    )
 
 
 # Aliases para compatibilidade
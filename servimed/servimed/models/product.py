@@ -3,7 +3,9 @@ Este módulo define a estrutura de dados para produtos extraídos
 da API, incluindo validação e serialização automática.
 """
 
-from pydantic import BaseModel, Field, validator
+from typing import Any, Dict, List, Sequence
+
+from pydantic import BaseModel, Field, TypeAdapter, field_validator
 
 
 class Product(BaseModel):
@@ -18,31 +20,50 @@ class Product(BaseModel):
     preco_fabrica: float = Field(..., description="Preço de fábrica do produto")
     estoque: int = Field(..., description="Quantidade em estoque")
 
-    @validator("preco_fabrica")
+    @field_validator("preco_fabrica")
+    @classmethod
     def validate_preco_fabrica(cls, v):
         """Valida que o preço não seja negativo."""
         if v < 0:
             raise ValueError("Preço de fábrica não pode ser negativo")
         return v
 
-    @validator("estoque")
+    @field_validator("estoque")
+    @classmethod
     def validate_estoque(cls, v):
         """Valida que o estoque não seja negativo."""
         if v < 0:
             raise ValueError("Estoque não pode ser negativo")
         return v
 
-    @validator("gtin")
+    @field_validator("gtin")
+    @classmethod
     def validate_gtin(cls, v):
         """Valida formato básico do GTIN."""
         if not v or len(v.strip()) == 0:
             raise ValueError("GTIN não pode estar vazio")
         return v.strip()
 
+    @classmethod
+    def from_records(cls, records: Sequence[Dict[str, Any]]) -> List["Product"]:
+        """
+        Valida uma lista de registros de uma só vez.
+
+        Raises:
+            ValidationError: Se qualquer registro for inválido
+        """
+        return _PRODUCT_LIST_ADAPTER.validate_python(records)
+
     def to_dict(self) -> dict:
         """Converte o modelo para dicionário."""
-        return self.dict()
+        # model_dump serializa direto no núcleo do pydantic v2, sem o wrapper
+        # depreciado de .dict() (que emite um aviso a cada chamada)
+        return self.model_dump()
 
     def __str__(self) -> str:
         """Representação string do produto."""
         return f"Product(id={self.id}, codigo='{self.codigo}', descricao='{self.descricao}')"
+
+
+# Validador da lista inteira (uma única chamada ao pydantic-core)
+_PRODUCT_LIST_ADAPTER = TypeAdapter(List[Product])
@@ -3,7 +3,7 @@ Modelos de dados para respostas da API.
 """
 
 from typing import Optional, Any, Dict
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, ConfigDict, Field
 
 
 class APIResponse(BaseModel):
@@ -11,6 +11,8 @@ class APIResponse(BaseModel):
 
     """
 
+    model_config = ConfigDict(frozen=True)
+
     success: bool = Field(..., description="Indica se a operação foi bem-sucedida")
     data: Optional[Any] = Field(None, description="Dados da resposta (se sucesso)")
     message: Optional[str] = Field(None, description="Mensagem informativa")
@@ -18,12 +20,7 @@ class APIResponse(BaseModel):
 
     def to_dict(self) -> Dict[str, Any]:
         """Converte para dicionário."""
-        return {
-            "success": self.success,
-            "data": self.data,
-            "message": self.message,
-            "timestamp": self.timestamp,
-        }
+        return self.model_dump()
 
 
 class ErrorResponse(BaseModel):
@@ -33,6 +30,8 @@ class ErrorResponse(BaseModel):
     Estrutura para erros e falhas.
     """
 
+    model_config = ConfigDict(frozen=True)
+
     success: bool = Field(False, description="Sempre false para erros")
     error: str = Field(..., description="Mensagem de erro")
     error_code: Optional[str] = Field(None, description="Código do erro")
@@ -42,12 +41,7 @@ class ErrorResponse(BaseModel):
 
     def to_dict(self) -> Dict[str, Any]:
         """Converte para dicionário."""
-        return {
-            "success": self.success,
-            "error": self.error,
-            "error_code": self.error_code,
-            "details": self.details,
-        }
+        return self.model_dump()
 
 
 class SuccessResponse(BaseModel):
@@ -57,10 +51,12 @@ class SuccessResponse(BaseModel):
     Estrutura para operações bem-sucedidas.
     """
 
+    model_config = ConfigDict(frozen=True)
+
     success: bool = Field(True, description="Sempre true para sucessos")
     data: Any = Field(..., description="Dados da resposta")
     message: Optional[str] = Field(None, description="Mensagem de sucesso")
 
     def to_dict(self) -> Dict[str, Any]:
         """Converte para dicionário."""
-        return {"success": self.success, "data": self.data, "message": self.message}
+        return self.model_dump()
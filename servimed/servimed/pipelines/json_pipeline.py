@@ -1,6 +1,5 @@
-import json
 import os
-from datetime import datetime
+import time
 from pathlib import Path
 from typing import Any, Dict
 
@@ -8,6 +7,10 @@ from scrapy import signals
 from scrapy.exceptions import DropItem
 
 from ..config import get_config
+from ..utils.json_backend import dumps_bytes as _dumps
+
+# Buffer de escrita do arquivo de saída (gravações sequenciais coalescidas)
+OUTPUT_BUFFER_SIZE = 1 << 20
 
 
 class JsonPipeline:
@@ -29,8 +32,12 @@ class JsonPipeline:
         # Contador de itens processados
         self.item_count = 0
 
-        # Lista para armazenar itens
-        self.items = []
+        # Validade de item por tipo (conjunto pequeno de tipos do spider)
+        self._valid_types: Dict[type, bool] = {dict: True}
+
+        # Arquivo de saída (aberto no primeiro item e gravado em streaming)
+        self.file = None
+        self.filepath = None
 
     @classmethod
     def from_crawler(cls, crawler):
@@ -52,11 +59,10 @@ class JsonPipeline:
             f"Pipeline JSON finalizado. Total de itens processados: {self.item_count}"
         )
 
-        # Salvar todos os itens em arquivo JSON
-        if self.items:
-            filename = self._get_output_filename()
-            self._save_to_json(self.items, filename)
-            spider.logger.info(f"✅ Arquivo JSON salvo: {filename}")
+        # Fechar o array JSON gravado em streaming
+        if self.file is not None:
+            self._close_output()
+            spider.logger.info(f"✅ Arquivo JSON salvo: {self.filepath.name}")
         else:
             spider.logger.warning("⚠️ Nenhum item para salvar")
 
@@ -74,11 +80,11 @@ class JsonPipeline:
         try:
             # Validar item
             if not self._is_valid_item(item):
-                spider.logger.warning(f"Item inválido ignorado: {item}")
+                spider.logger.warning("Item inválido ignorado: %s", item)
                 raise DropItem("Item inválido")
 
-            # Adicionar item à lista
-            self.items.append(item)
+            # Gravar item no arquivo de saída
+            self._write_item(item)
 
             # Incrementar contador
             self.item_count += 1
@@ -103,13 +109,13 @@ class JsonPipeline:
         Returns:
             True se válido, False caso contrário
         """
-        # Verificar se é um dict ou tem método to_dict
-        if isinstance(item, dict):
-            return True
-        elif hasattr(item, "to_dict"):
-            return True
-        else:
-            return False
+        # Verificar se é um dict ou tem método to_dict (resultado em cache por tipo)
+        item_type = type(item)
+        valid = self._valid_types.get(item_type)
+        if valid is None:
+            valid = issubclass(item_type, dict) or hasattr(item_type, "to_dict")
+            self._valid_types[item_type] = valid
+        return valid
 
     def _get_output_filename(self) -> str:
         """
@@ -118,25 +124,40 @@ class JsonPipeline:
         Returns:
             Nome do arquivo com timestamp
         """
-        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+        timestamp = time.strftime("%Y%m%d_%H%M%S")
         return f"{self.filename_prefix}_{timestamp}.json"
 
-    def _save_to_json(self, data: list, filename: str):
+    def _open_output(self) -> None:
+        """Abre o arquivo de saída com buffer grande e inicia o array JSON."""
+        self.filepath = self.output_dir / self._get_output_filename()
+        self.file = open(self.filepath, "wb", buffering=OUTPUT_BUFFER_SIZE)
+        self.file.write(b"[\n")
+
+    def _write_item(self, item: Any) -> None:
         """
-        Salva dados em arquivo JSON.
+        Serializa e grava um item no arquivo de saída.
 
         Args:
-            data: Lista de dados para salvar
-            filename: Nome do arquivo
+            item: Item (dict ou objeto com to_dict) a ser gravado
         """
-        filepath = self.output_dir / filename
+        data = item if isinstance(item, dict) else item.to_dict()
+        payload = _dumps(data)
 
-        try:
-            with open(filepath, "w", encoding="utf-8") as f:
-                json.dump(data, f, ensure_ascii=False, indent=2)
+        if self.file is None:
+            self._open_output()
+        else:
+            self.file.write(b",\n")
+        self.file.write(payload)
 
-            print(f"✅ Dados salvos em: {filepath}")
+    def _close_output(self) -> None:
+        """Finaliza o array JSON e fecha o arquivo de saída."""
+        try:
+            self.file.write(b"\n]\n")
+            self.file.close()
+            print(f"✅ Dados salvos em: {self.filepath}")
 
         except Exception as e:
-            print(f"❌ Erro ao salvar arquivo {filepath}: {e}")
+            print(f"❌ Erro ao salvar arquivo {self.filepath}: {e}")
             raise
+        finally:
+            self.file = None
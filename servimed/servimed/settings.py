@@ -2,7 +2,9 @@
 import sys
 import os
 
-sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+_PROJECT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if _PROJECT_DIR not in sys.path:
+    sys.path.append(_PROJECT_DIR)
 
 try:
     from config import get_config
@@ -41,13 +43,21 @@ else:
     DOWNLOAD_TIMEOUT = 30
     LOG_LEVEL = "INFO"
 
-# Headers para APIs
+# Anunciar brotli apenas se houver decodificador instalado
+try:
+    import brotli  # noqa: F401
+
+    _ACCEPT_ENCODING = b"gzip, deflate, br"
+except ImportError:
+    _ACCEPT_ENCODING = b"gzip, deflate"
+
+# Headers para APIs (valores em bytes: o Scrapy não precisa codificá-los)
 DEFAULT_REQUEST_HEADERS = {
-    "Accept": "application/json, text/plain, */*",
-    "Accept-Language": "pt-BR,pt;q=0.9,en;q=0.8",
-    "Accept-Encoding": "gzip, deflate, br",
-    "User-Agent": "Servimed-Scrapy/1.0 (+https://github.com/servimed)",
-    "Connection": "keep-alive",
+    "Accept": b"application/json, text/plain, */*",
+    "Accept-Language": b"pt-BR,pt;q=0.9,en;q=0.8",
+    "Accept-Encoding": _ACCEPT_ENCODING,
+    "User-Agent": b"Servimed-Scrapy/1.0 (+https://github.com/servimed)",
+    "Connection": b"keep-alive",
 }
 
 # Configurações de retry e cache
@@ -1,16 +1,59 @@
-import json
+import io
 import logging
 import urllib.parse
-from typing import Dict, Any, Optional
+from typing import Dict, Any, List, Optional
 
 import scrapy
+from pydantic import ValidationError
 from scrapy.http import Request, Response
 from scrapy.exceptions import CloseSpider
 
+from servimed.utils.json_backend import JSONDecodeError, loads as _json_loads
+
+
+# Parser sob demanda (opcional): converte apenas os campos usados pelo Product
+try:
+    import simdjson
+except ImportError:
+    simdjson = None
+
+# Parser em streaming (opcional) para catálogos grandes
+try:
+    import ijson
+except ImportError:
+    ijson = None
+
 from ..config import get_config
 from ..models.product import Product
 from ..models.auth import AuthCredentials, AuthToken, AuthResponse
 
+# Campos lidos de cada produto da API
+_PRODUCT_FIELDS = tuple(Product.model_fields)
+
+# Acima deste tamanho o corpo é decodificado em streaming, em lotes de produtos
+STREAM_PARSE_THRESHOLD = 16 * 1024 * 1024
+PRODUCT_BATCH_SIZE = 1000
+
+# Headers e corpo da autenticação OAuth2 (montados uma única vez)
+_AUTH_HEADERS = {
+    "Content-Type": "application/x-www-form-urlencoded",
+    "Accept": "application/json",
+}
+_AUTH_BODY_TEMPLATE = (
+    "grant_type=password&username={username}&password={password}"
+    "&scope=&client_id=string&client_secret=%2A%2A%2A%2A%2A%2A%2A%2A"
+)
+
+# Headers JSON estáticos (Authorization é acrescentado por requisição)
+_ACCEPT_JSON_HEADERS = {"Accept": "application/json"}
+
+
+def _build_auth_body(username: str, password: str) -> str:
+    """Monta o corpo urlencoded da autenticação OAuth2."""
+    return _AUTH_BODY_TEMPLATE.format(
+        username=urllib.parse.quote_plus(username), password=urllib.parse.quote_plus(password)
+    )
+
 
 class ServimedApiSpider(scrapy.Spider):
     """
@@ -23,6 +66,18 @@ class ServimedApiSpider(scrapy.Spider):
     name = "servimed_api"
     allowed_domains = ["desafio.cotefacil.net"]
 
+    # Concorrência adaptativa: o AutoThrottle ajusta o atraso conforme a latência
+    custom_settings = {
+        "AUTOTHROTTLE_ENABLED": True,
+        "AUTOTHROTTLE_TARGET_CONCURRENCY": 8.0,
+        "AUTOTHROTTLE_MAX_DELAY": 10,
+        "CONCURRENT_REQUESTS_PER_DOMAIN": 16,
+        "DOWNLOAD_TIMEOUT": 30,
+        "HTTPCOMPRESSION_ENABLED": True,
+        "RETRY_ENABLED": True,
+        "RETRY_TIMES": 3,
+    }
+
     def __init__(self, *args, **kwargs):
         """Inicializa o spider com configurações."""
         super().__init__(*args, **kwargs)
@@ -44,6 +99,9 @@ class ServimedApiSpider(scrapy.Spider):
         # Token de acesso
         self.access_token: Optional[str] = None
 
+        # Parser simdjson reutilizado entre respostas (reaproveita o buffer interno)
+        self._json_parser = simdjson.Parser() if simdjson is not None else None
+
         # Logger já disponível via Scrapy (self.logger)
 
         self.logger.info("Spider ServimedApi inicializado")
@@ -60,28 +118,14 @@ class ServimedApiSpider(scrapy.Spider):
         """
         self.logger.info("Iniciando fluxo de autenticação...")
 
-        # Dados para autenticação
-        auth_data = {
-            "grant_type": "password",
-            "username": self.credentials.username,
-            "password": self.credentials.password,
-            "scope": "",
-            "client_id": "string",
-            "client_secret": "********",
-        }
-
-        # Headers para autenticação
-        headers = {
-            "Content-Type": "application/x-www-form-urlencoded",
-            "Accept": "application/json",
-        }
-
         # Request de autenticação
         yield Request(
             url=self.token_url,
             method="POST",
-            headers=headers,
-            body=urllib.parse.urlencode(auth_data),
+            headers=_AUTH_HEADERS,
+            body=_build_auth_body(
+                self.credentials.username, self.credentials.password
+            ),
             callback=self.parse_auth_response,
             errback=self.handle_auth_error,
             meta={"dont_cache": True},
@@ -102,7 +146,7 @@ class ServimedApiSpider(scrapy.Spider):
                 raise CloseSpider(f"Falha na autenticação: Status {response.status}")
 
             # Parsear resposta JSON
-            auth_data = json.loads(response.text)
+            auth_data = _json_loads(response.body)
             self.logger.info("Resposta de autenticação recebida")
 
             # Validar estrutura da resposta
@@ -122,8 +166,8 @@ class ServimedApiSpider(scrapy.Spider):
             # Iniciar extração de produtos
             yield self.create_products_request()
 
-        except json.JSONDecodeError as e:
-            self.logger.error(f"Erro ao decodificar resposta JSON: {e}")
+        except JSONDecodeError as e:
+            self.logger.error("Erro ao decodificar resposta JSON: %s", e)
             raise CloseSpider(f"Resposta de autenticação inválida: {e}")
         except Exception as e:
             self.logger.error(f"Erro inesperado na autenticação: {e}")
@@ -138,10 +182,7 @@ class ServimedApiSpider(scrapy.Spider):
         self.logger.info("Criando request para extração de produtos...")
 
         # Headers com autorização
-        headers = {
-            "Accept": "application/json",
-            "Authorization": f"Bearer {self.access_token}",
-        }
+        headers = dict(_ACCEPT_JSON_HEADERS, Authorization=f"Bearer {self.access_token}")
 
         # Request para produtos
         return Request(
@@ -164,11 +205,22 @@ class ServimedApiSpider(scrapy.Spider):
 
             # Verificar status da resposta
             if response.status != 200:
-                self.logger.error(f"Erro na API de produtos: Status {response.status}")
+                self.logger.error("Erro na API de produtos: Status %s", response.status)
                 raise CloseSpider(f"Falha na API de produtos: Status {response.status}")
 
+            # Catálogos grandes: decodificar em streaming (memória limitada ao lote)
+            if ijson is not None and len(response.body) > STREAM_PARSE_THRESHOLD:
+                yield from self._stream_products(response.body)
+                self.logger.info("Processamento de produtos concluído")
+                return
+
             # Parsear resposta JSON
-            products_data = json.loads(response.text)
+            if self._json_parser is not None:
+                products_data = self._select_product_fields(
+                    self._json_parser.parse(response.body)
+                )
+            else:
+                products_data = _json_loads(response.body)
             self.logger.info("Dados de produtos recebidos")
 
             # Verificar se é uma lista
@@ -176,35 +228,97 @@ class ServimedApiSpider(scrapy.Spider):
                 self.logger.error("Resposta não é uma lista de produtos")
                 raise CloseSpider("Formato de resposta inválido")
 
-            self.logger.info(f"Total de produtos encontrados: {len(products_data)}")
-
-            # Processar cada produto
-            for product_data in products_data:
-                try:
-                    # Criar modelo de produto
-                    product = Product(**product_data)
-
-                    # Log do produto
-                    self.logger.debug(f"Produto processado: {product}")
+            self.logger.info("Total de produtos encontrados: %d", len(products_data))
 
-                    # Enviar para o pipeline
-                    yield product.to_dict()
-
-                except Exception as e:
-                    self.logger.warning(
-                        f"Erro ao processar produto {product_data.get('id', 'N/A')}: {e}"
-                    )
-                    continue
+            yield from self._emit_products(products_data)
 
             self.logger.info("Processamento de produtos concluído")
 
-        except json.JSONDecodeError as e:
-            self.logger.error(f"Erro ao decodificar resposta JSON: {e}")
+        except JSONDecodeError as e:
+            self.logger.error("Erro ao decodificar resposta JSON: %s", e)
             raise CloseSpider(f"Resposta de produtos inválida: {e}")
         except Exception as e:
-            self.logger.error(f"Erro inesperado no processamento: {e}")
+            self.logger.error("Erro inesperado no processamento: %s", e)
             raise CloseSpider(f"Erro no processamento: {e}")
 
+    def _stream_products(self, body: bytes):
+        """
+        Decodifica a lista de produtos em streaming e emite lote a lote.
+
+        Apenas um lote de dicts fica em memória por vez.
+        """
+        if body[:64].lstrip()[:1] != b"[":
+            self.logger.error("Resposta não é uma lista de produtos")
+            raise CloseSpider("Formato de resposta inválido")
+
+        total = 0
+        batch = []
+        for record in ijson.items(io.BytesIO(body), "item", use_float=True):
+            batch.append(record)
+            if len(batch) >= PRODUCT_BATCH_SIZE:
+                yield from self._emit_products(batch)
+                total += len(batch)
+                batch = []
+
+        if batch:
+            yield from self._emit_products(batch)
+            total += len(batch)
+
+        self.logger.info("Total de produtos encontrados: %d", total)
+
+    def _emit_products(self, products_data: List[Any]):
+        """Valida os produtos e emite seus dicionários para o pipeline."""
+        # Validar todos os produtos de uma vez; se algum for inválido,
+        # validar item a item para descartar apenas os inválidos
+        try:
+            products = Product.from_records(products_data)
+        except ValidationError:
+            products = self._validate_each(products_data)
+
+        # Verificar o nível de log uma vez, não a cada produto
+        log_debug = self.logger.isEnabledFor(logging.DEBUG)
+
+        for product in products:
+            # Log do produto
+            if log_debug:
+                self.logger.debug("Produto processado: %s", product)
+
+            # Enviar para o pipeline
+            yield product.to_dict()
+
+    def _validate_each(self, products_data: List[Any]) -> List[Product]:
+        """Valida produtos individualmente, ignorando os inválidos."""
+        products = []
+        for product_data in products_data:
+            try:
+                # Criar modelo de produto
+                products.append(Product(**product_data))
+            except Exception as e:
+                self.logger.warning(
+                    "Erro ao processar produto %s: %s",
+                    product_data.get("id", "N/A"),
+                    e,
+                )
+        return products
+
+    @staticmethod
+    def _select_product_fields(document: Any) -> Any:
+        """
+        Materializa apenas os campos do Product de um documento simdjson.
+
+        Os dicts são extraídos antes de qualquer yield: proxies do simdjson
+        deixam de ser válidos quando o parser processa outro documento.
+        """
+        if not isinstance(document, simdjson.Array):
+            return document
+
+        return [
+            {field: item[field] for field in _PRODUCT_FIELDS if field in item}
+            if isinstance(item, simdjson.Object)
+            else item
+            for item in document
+        ]
+
     def handle_auth_error(self, failure):
         """
         Trata erros de autenticação.
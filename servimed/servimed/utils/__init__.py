@@ -0,0 +1,9 @@
+"""
+Módulo de utilitários do projeto Servimed.
+
+Este módulo contém funções auxiliares compartilhadas:
+- Backend JSON mais rápido disponível
+"""
+
+__version__ = "1.0.0"
+__author__ = "Desenvolvedor"
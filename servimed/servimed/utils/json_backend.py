@@ -0,0 +1,50 @@
+"""
+Backend JSON escolhido em tempo de importação.
+
+Usa o decodificador mais rápido instalado (orjson, ujson ou json da
+stdlib) e expõe `loads`, `dumps`, `dumps_bytes` e `JSONDecodeError` com
+a mesma interface, sem try/except a cada chamada.
+"""
+
+from typing import Any
+
+try:
+    import orjson
+
+    BACKEND = "orjson"
+    loads = orjson.loads
+    JSONDecodeError = orjson.JSONDecodeError
+
+    def dumps(obj: Any) -> str:
+        """Serializa um objeto para uma string JSON."""
+        return orjson.dumps(obj).decode()
+
+    def dumps_bytes(obj: Any) -> bytes:
+        """Serializa um objeto para bytes JSON UTF-8 (corpo de requisição)."""
+        return orjson.dumps(obj)
+
+except ImportError:
+    try:
+        import ujson
+
+        BACKEND = "ujson"
+        loads = ujson.loads
+        dumps = ujson.dumps
+        JSONDecodeError = ujson.JSONDecodeError
+
+        def dumps_bytes(obj: Any) -> bytes:
+            """Serializa um objeto para bytes JSON UTF-8 (corpo de requisição)."""
+            return ujson.dumps(obj, ensure_ascii=False).encode()
+    except ImportError:
+        import json
+
+        BACKEND = "json"
+        loads = json.loads
+        dumps = json.dumps
+        JSONDecodeError = json.JSONDecodeError
+
+        def dumps_bytes(obj: Any) -> bytes:
+            """Serializa um objeto para bytes JSON UTF-8 (corpo de requisição)."""
+            return json.dumps(obj, ensure_ascii=False).encode()
+
+__all__ = ["BACKEND", "JSONDecodeError", "dumps", "dumps_bytes", "loads"]
@@ -3,20 +3,125 @@ Tarefas de processamento de pedidos - Fase 3
 Sistema de pedidos integrado ao scraping Servimed
 """
 
+import json
 import time
+import random
+import hashlib
 import logging
 import requests
-from typing import Dict, Any, List
+from concurrent.futures import ThreadPoolExecutor
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+from typing import Dict, Any, List, Optional
 from datetime import datetime
 
 from servimed.models.order import OrderRequest, OrderResponse, Order
 from servimed.config import get_config
+from servimed.utils.json_backend import (
+    dumps as _json_dumps,
+    dumps_bytes as _json_dumps_bytes,
+    loads as _json_loads,
+)
 from celery_app import celery_app
 
 # Configurar logging
 logger = logging.getLogger(__name__)
 config = get_config()
 
+# Máximo de compras de produtos simuladas em paralelo
+MAX_PURCHASE_WORKERS = 32
+
+# Sessão HTTP compartilhada (reutiliza conexões keep-alive entre chamadas)
+_session = requests.Session()
+_adapter = HTTPAdapter(
+    pool_connections=20,
+    pool_maxsize=50,
+    max_retries=Retry(total=3, backoff_factor=0.3, status_forcelist=[502, 503, 504]),
+)
+_session.mount("http://", _adapter)
+_session.mount("https://", _adapter)
+
+# Idempotência: redeliveries do Celery não reprocessam o mesmo pedido.
+# A chave é o hash do payload completo, não só do id_pedido informado pelo
+# cliente, para que outro usuário ou outro conteúdo não colida com ele
+ORDER_LOCK_PREFIX = "servimed:order:lock:"
+ORDER_RESULT_PREFIX = "servimed:order:result:"
+ORDER_IDEMPOTENCY_TTL = 3600  # segundos
+
+# Corpo fixo do PATCH de atualização (serializado uma única vez)
+_UPDATE_ORDER_BODY = _json_dumps_bytes(
+    {"status": "processado", "codigo_fornecedor": "SERVIDMED_001"}
+)
+
+
+def _order_key(task_data: Dict[str, Any]) -> str:
+    """Identificador do pedido para idempotência (hash do payload normalizado)."""
+    payload = json.dumps(task_data, sort_keys=True, separators=(",", ":"), default=str)
+    return hashlib.sha256(payload.encode()).hexdigest()
+
+
+def _claim_order(order_key: str) -> bool:
+    """
+    Reserva o pedido para processamento (SET NX).
+
+    Returns:
+        False se o pedido já foi reservado por outra execução
+    """
+    client = getattr(celery_app.backend, "client", None)
+    if client is None:
+        return True
+    try:
+        return bool(
+            client.set(
+                f"{ORDER_LOCK_PREFIX}{order_key}",
+                "pending",
+                nx=True,
+                ex=ORDER_IDEMPOTENCY_TTL,
+            )
+        )
+    except Exception as e:
+        logger.warning("Controle de idempotência indisponível: %s", e)
+        return True
+
+
+def _release_order(order_key: str) -> None:
+    """Libera a reserva do pedido para que possa ser reprocessado."""
+    client = getattr(celery_app.backend, "client", None)
+    if client is None:
+        return
+    try:
+        client.delete(f"{ORDER_LOCK_PREFIX}{order_key}")
+    except Exception as e:
+        logger.warning("Não foi possível liberar o pedido %s: %s", order_key, e)
+
+
+def _get_order_result(order_key: str) -> Optional[Dict[str, Any]]:
+    """Retorna o resultado já armazenado do pedido, se houver."""
+    client = getattr(celery_app.backend, "client", None)
+    if client is None:
+        return None
+    try:
+        cached = client.get(f"{ORDER_RESULT_PREFIX}{order_key}")
+    except Exception as e:
+        logger.warning("Resultado do pedido indisponível: %s", e)
+        return None
+    return _json_loads(cached) if cached else None
+
+
+def _store_order_result(order_key: str, result: Dict[str, Any]) -> None:
+    """Armazena o resultado do pedido processado."""
+    client = getattr(celery_app.backend, "client", None)
+    if client is None:
+        return
+    try:
+        client.set(
+            f"{ORDER_RESULT_PREFIX}{order_key}",
+            _json_dumps(result),
+            ex=ORDER_IDEMPOTENCY_TTL,
+        )
+    except Exception as e:
+        logger.warning("Não foi possível armazenar o resultado do pedido: %s", e)
+
 
 @celery_app.task(bind=True, name="servimed.order_tasks.execute_order")
 def execute_order(self, task_data: Dict[str, Any]) -> Dict[str, Any]:
@@ -29,6 +134,7 @@ def execute_order(self, task_data: Dict[str, Any]) -> Dict[str, Any]:
     Returns:
         Dicionário com resultado do processamento
     """
+    claimed = False
     try:
         task_id = self.request.id
         logger.info(
@@ -46,7 +152,24 @@ def execute_order(self, task_data: Dict[str, Any]) -> Dict[str, Any]:
         if not all([usuario, senha, id_pedido, produtos, callback_url]):
             raise ValueError("Dados obrigatórios não fornecidos")
 
-        logger.info(f"Processando pedido {id_pedido} com {len(produtos)} produtos")
+        # Ignorar redeliveries de pedidos já processados ou em andamento
+        order_key = _order_key(task_data)
+        if not _claim_order(order_key):
+            cached_result = _get_order_result(order_key)
+            if cached_result is not None:
+                logger.info("Pedido %s já processado; retornando resultado", id_pedido)
+                return cached_result
+            logger.warning("Pedido %s já está em processamento", id_pedido)
+            return {
+                "task_id": task_id,
+                "id_pedido": id_pedido,
+                "status": "duplicate",
+                "processing_time": time.time(),
+                "message": "Pedido já está em processamento",
+            }
+        claimed = True
+
+        logger.info("Processando pedido %s com %d produtos", id_pedido, len(produtos))
 
         # PASSO 1: Simular login no Servimed
         logger.info("Simulando login no Servimed...")
@@ -63,18 +186,23 @@ def execute_order(self, task_data: Dict[str, Any]) -> Dict[str, Any]:
         logger.info("Integrando com API do desafio...")
         challenge_order = create_challenge_order(produtos)
 
-        # PASSO 4: Atualizar pedido via PATCH
-        logger.info("Atualizando pedido via PATCH...")
-        update_result = update_challenge_order(challenge_order["id"], order_result)
-
-        # PASSO 5: Preparar resposta de confirmação
+        # PASSO 4: Preparar resposta de confirmação
         confirmation = OrderResponse(
             codigo_confirmacao=challenge_order["id"], status="pedido_realizado"
         )
 
-        # PASSO 6: Enviar callback
-        logger.info("Enviando callback...")
-        callback_success = send_callback(callback_url, confirmation.dict())
+        # PASSOS 5 e 6: PATCH e callback dependem apenas do ID do pedido,
+        # então as duas requisições são feitas em paralelo
+        logger.info("Atualizando pedido via PATCH e enviando callback...")
+        with ThreadPoolExecutor(max_workers=2) as executor:
+            update_future = executor.submit(
+                update_challenge_order, challenge_order["id"], order_result
+            )
+            callback_future = executor.submit(
+                send_callback, callback_url, confirmation.model_dump()
+            )
+            update_result = update_future.result()
+            callback_success = callback_future.result()
 
         if not callback_success:
             logger.warning("Callback falhou, mas pedido foi processado")
@@ -85,17 +213,21 @@ def execute_order(self, task_data: Dict[str, Any]) -> Dict[str, Any]:
             "id_pedido": id_pedido,
             "status": "completed",
             "challenge_order_id": challenge_order["id"],
-            "confirmation": confirmation.dict(),
+            "confirmation": confirmation.model_dump(),
             "callback_sent": callback_success,
             "processing_time": time.time(),
             "message": "Pedido processado com sucesso",
         }
 
-        logger.info(f"Pedido {id_pedido} processado com sucesso")
+        _store_order_result(order_key, result)
+
+        logger.info("Pedido %s processado com sucesso", id_pedido)
         return result
 
     except Exception as e:
-        logger.error(f"Erro ao processar pedido: {str(e)}")
+        logger.error("Erro ao processar pedido: %s", e)
+        if claimed:
+            _release_order(order_key)
         return {
             "task_id": getattr(self, "request", {}).get("id", "unknown"),
             "id_pedido": task_data.get("id_pedido"),
@@ -125,8 +257,6 @@ def simulate_servimed_login(usuario: str, senha: str) -> bool:
         time.sleep(1)  # Simular tempo de processamento
 
         # Simular sucesso (90% das vezes)
-        import random
-
         success = random.random() > 0.1
 
         if success:
@@ -141,49 +271,63 @@ def simulate_servimed_login(usuario: str, senha: str) -> bool:
         return False
 
 
-def simulate_product_purchase(produtos: List[Dict[str, Any]]) -> Dict[str, Any]:
+def _simulate_one(produto: Dict[str, Any]) -> Dict[str, Any]:
     """
-    Simula busca e compra dos produtos.
+    Simula busca, adição ao carrinho e compra de um único produto.
 
     Args:
-        produtos: Lista de produtos para comprar
+        produto: Produto a ser comprado
 
     Returns:
-        Resultado da simulação de compra
+        Resultado da compra do produto
     """
-    try:
-        logger.info(f"Simulando compra de {len(produtos)} produtos")
+    gtin = produto.get("gtin")
+    codigo = produto.get("codigo")
+    quantidade = produto.get("quantidade")
 
-        purchase_results = []
+    logger.info(
+        "Simulando compra: %s (GTIN: %s) - Qtd: %s", codigo, gtin, quantidade
+    )
 
-        for produto in produtos:
-            gtin = produto.get("gtin")
-            codigo = produto.get("codigo")
-            quantidade = produto.get("quantidade")
+    # Simular busca do produto
+    time.sleep(0.5)
 
-            logger.info(
-                f"Simulando compra: {codigo} (GTIN: {gtin}) - Qtd: {quantidade}"
-            )
+    # Simular adição ao carrinho
+    time.sleep(0.3)
 
-            # Simular busca do produto
-            time.sleep(0.5)
+    # Simular finalização da compra
+    time.sleep(0.7)
 
-            # Simular adição ao carrinho
-            time.sleep(0.3)
+    return {
+        "gtin": gtin,
+        "codigo": codigo,
+        "quantidade": quantidade,
+        "status": "comprado",
+        "preco_unitario": 10.50,  # Mock
+        "preco_total": 10.50 * quantidade,
+    }
 
-            # Simular finalização da compra
-            time.sleep(0.7)
 
-            purchase_results.append(
-                {
-                    "gtin": gtin,
-                    "codigo": codigo,
-                    "quantidade": quantidade,
-                    "status": "comprado",
-                    "preco_unitario": 10.50,  # Mock
-                    "preco_total": 10.50 * quantidade,
-                }
-            )
+def simulate_product_purchase(produtos: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """
+    Simula busca e compra dos produtos.
+
+    Args:
+        produtos: Lista de produtos para comprar
+
+    Returns:
+        Resultado da simulação de compra
+    """
+    try:
+        logger.info("Simulando compra de %d produtos", len(produtos))
+
+        # Produtos independentes: simular as compras em paralelo (ordem preservada)
+        purchase_results = []
+        if produtos:
+            with ThreadPoolExecutor(
+                max_workers=min(MAX_PURCHASE_WORKERS, len(produtos))
+            ) as executor:
+                purchase_results = list(executor.map(_simulate_one, produtos))
 
         result = {
             "produtos_comprados": purchase_results,
@@ -196,7 +340,7 @@ def simulate_product_purchase(produtos: List[Dict[str, Any]]) -> Dict[str, Any]:
         return result
 
     except Exception as e:
-        logger.error(f"Erro na simulação de compra: {str(e)}")
+        logger.error("Erro na simulação de compra: %s", e)
         return {"status": "erro", "error": str(e)}
 
 
@@ -210,20 +354,21 @@ def create_challenge_order(produtos: List[Dict[str, Any]]) -> Dict[str, Any]:
     Returns:
         Dados do pedido criado
     """
+    # Itens do pedido (reutilizados também no pedido simulado)
+    itens = [
+        {
+            "gtin": prod["gtin"],
+            "codigo": prod["codigo"],
+            "quantidade": prod["quantidade"],
+        }
+        for prod in produtos
+    ]
+
     try:
         logger.info("Criando pedido na API do desafio")
 
         # Preparar dados para a API
-        order_data = {
-            "itens": [
-                {
-                    "gtin": prod["gtin"],
-                    "codigo": prod["codigo"],
-                    "quantidade": prod["quantidade"],
-                }
-                for prod in produtos
-            ]
-        }
+        order_data = {"itens": itens}
 
         # URL da API do desafio
         api_url = "https://desafio.cotefacil.net"
@@ -232,7 +377,9 @@ def create_challenge_order(produtos: List[Dict[str, Any]]) -> Dict[str, Any]:
         headers = {"Content-Type": "application/json", "Accept": "application/json"}
 
         # Fazer POST para criar pedido
-        response = requests.post(api_url, json=order_data, headers=headers, timeout=30)
+        response = _session.post(
+            api_url, data=_json_dumps_bytes(order_data), headers=headers, timeout=30
+        )
 
         if response.status_code == 201:
             order_result = response.json()
@@ -247,7 +394,7 @@ def create_challenge_order(produtos: List[Dict[str, Any]]) -> Dict[str, Any]:
                 "id": 999,
                 "codigo_fornecedor": None,
                 "status": "simulado",
-                "itens": order_data["itens"],
+                "itens": itens,
             }
 
     except Exception as e:
@@ -257,14 +404,7 @@ def create_challenge_order(produtos: List[Dict[str, Any]]) -> Dict[str, Any]:
             "id": 999,
             "codigo_fornecedor": None,
             "status": "simulado",
-            "itens": [
-                {
-                    "gtin": prod["gtin"],
-                    "codigo": prod["codigo"],
-                    "quantidade": prod["quantidade"],
-                }
-                for prod in produtos
-            ],
+            "itens": itens,
         }
 
 
@@ -282,9 +422,6 @@ def update_challenge_order(order_id: int, order_result: Dict[str, Any]) -> bool:
     try:
         logger.info(f"Atualizando pedido {order_id} via PATCH")
 
-        # Dados para atualização
-        update_data = {"status": "processado", "codigo_fornecedor": "SERVIDMED_001"}
-
         # URL da API do desafio
         api_url = f"https://desafio.cotefacil.net/pedido/{order_id}"
 
@@ -292,8 +429,8 @@ def update_challenge_order(order_id: int, order_result: Dict[str, Any]) -> bool:
         headers = {"Content-Type": "application/json", "Accept": "application/json"}
 
         # Fazer PATCH para atualizar pedido
-        response = requests.patch(
-            api_url, json=update_data, headers=headers, timeout=30
+        response = _session.patch(
+            api_url, data=_UPDATE_ORDER_BODY, headers=headers, timeout=30
         )
 
         if response.status_code == 200:
@@ -326,8 +463,11 @@ def send_callback(callback_url: str, confirmation_data: Dict[str, Any]) -> bool:
         headers = {"Content-Type": "application/json", "Accept": "application/json"}
 
         # Fazer POST para enviar callback
-        response = requests.post(
-            callback_url, json=confirmation_data, headers=headers, timeout=30
+        response = _session.post(
+            callback_url,
+            data=_json_dumps_bytes(confirmation_data),
+            headers=headers,
+            timeout=30,
         )
 
         if response.status_code in [200, 201, 202]:
@@ -5,57 +5,252 @@ Este módulo define as tarefas que serão executadas pelos workers
 Celery para extrair produtos e enviar para API de callback.
 """
 
+import gzip
+import math
 import time
+import hashlib
 import logging
 import requests
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import quote_plus
+from requests.adapters import HTTPAdapter
+from urllib3.util import make_headers
+from urllib3.util.retry import Retry
 from datetime import datetime
-from typing import Dict, Any, Optional
+from functools import lru_cache
+from typing import Dict, Any, NamedTuple, Optional, Tuple
+
+from celery import chain
+from celery.concurrency.prefork import TaskPool as PreforkPool
+from celery.signals import worker_process_init, worker_process_shutdown, worker_ready
+from pydantic import ValidationError
 
 from celery_app import celery_app
-from models.scraping_task import ScrapingResult
+from models.scraping_task import ScrapingResult, ScrapingTaskRequest
 from servimed.config import get_config
+from servimed.utils.json_backend import (
+    dumps_bytes as _json_dumps_bytes,
+    loads as _json_loads,
+)
 
 
 logger = logging.getLogger(__name__)
 
+# Sessão HTTP compartilhada (reutiliza conexões keep-alive entre chamadas)
+_session = requests.Session()
+_adapter = HTTPAdapter(
+    pool_connections=20,
+    pool_maxsize=50,
+    # Falhas transitórias são repetidas na própria conexão, sem refazer a
+    # tarefa inteira; 429 respeita o Retry-After enviado pela API.
+    # POST (callback, signup, token) só é repetido em erro de conexão, quando
+    # a requisição nem chegou ao servidor: leitura e status ficam restritos a
+    # métodos idempotentes para não reenviar um callback já processado
+    max_retries=Retry(
+        total=4,
+        connect=3,
+        read=3,
+        backoff_factor=0.5,
+        status_forcelist=[429, 500, 502, 503, 504],
+        allowed_methods=frozenset(["GET", "HEAD"]),
+        raise_on_status=False,
+    ),
+)
+_session.mount("http://", _adapter)
+_session.mount("https://", _adapter)
+# Solicitar respostas comprimidas (br/zstd apenas se houver decodificador)
+_session.headers.update(make_headers(accept_encoding=True))
+
+# Timeouts (conexão, leitura) em segundos
+REQUEST_TIMEOUT = (5, 30)
+CALLBACK_TIMEOUT = (5, 60)
+
+# Headers e corpo da autenticação OAuth2 (montados uma única vez)
+_AUTH_HEADERS = {
+    "Content-Type": "application/x-www-form-urlencoded",
+    "Accept": "application/json",
+}
+_AUTH_BODY_TEMPLATE = (
+    "grant_type=password&username={username}&password={password}"
+    "&scope=&client_id=string&client_secret=%2A%2A%2A%2A%2A%2A%2A%2A"
+)
+
+# Headers JSON estáticos (Authorization é acrescentado por requisição)
+_ACCEPT_JSON_HEADERS = {"Accept": "application/json"}
+_JSON_HEADERS = {"Content-Type": "application/json", "Accept": "application/json"}
+
+
+def _build_auth_body(username: str, password: str) -> str:
+    """Monta o corpo urlencoded da autenticação OAuth2."""
+    return _AUTH_BODY_TEMPLATE.format(
+        username=quote_plus(username), password=quote_plus(password)
+    )
+
+
+class _ApiUrls(NamedTuple):
+    """URLs completas dos endpoints da API."""
+
+    signup: str
+    token: str
+    products: str
+
+
+@lru_cache(maxsize=1)
+def _api_urls() -> _ApiUrls:
+    """Monta as URLs dos endpoints uma única vez (a configuração é fixa)."""
+    api = get_config().api
+    return _ApiUrls(
+        signup=f"{api.base_url}{api.signup_endpoint}",
+        token=f"{api.base_url}{api.token_endpoint}",
+        products=f"{api.base_url}{api.products_endpoint}",
+    )
+
+
+def _warm_up() -> None:
+    """Carrega a configuração e abre uma conexão keep-alive com a API."""
+    try:
+        _api_urls()
+        base_url = get_config().api.base_url
+        if base_url:
+            _session.head(base_url, timeout=REQUEST_TIMEOUT)
+    except Exception as e:
+        logger.warning("Aquecimento do worker falhou: %s", e)
 
-def _authenticate_oauth2(username: str, password: str) -> Optional[str]:
-    """Realiza autenticação OAuth2 com a API de callback."""
+
+@worker_process_init.connect
+def _warm_up_worker_process(**kwargs) -> None:
+    """Aquece cada processo filho do pool prefork."""
+    _warm_up()
+
+
+@worker_ready.connect
+def _warm_up_worker(sender=None, **kwargs) -> None:
+    """Aquece workers que executam tarefas no processo principal
+    (solo, threads, gevent); no prefork cada filho se aquece sozinho."""
+    if not isinstance(getattr(sender, "pool", None), PreforkPool):
+        _warm_up()
+
+
+@worker_process_shutdown.connect
+def _close_session(**kwargs) -> None:
+    """Fecha as conexões do pool HTTP ao encerrar o processo."""
+    _session.close()
+
+
+# Produtos incluídos como amostra no resultado da tarefa
+RESULT_SAMPLE_SIZE = 5
+
+# Máximo de partes enviadas em paralelo ao callback
+MAX_CALLBACK_WORKERS = 4
+
+# Cache de tokens OAuth2 no Redis do backend Celery
+TOKEN_CACHE_PREFIX = "servimed:token:"
+TOKEN_EXPIRY_MARGIN = 60  # segundos descontados da validade do token
+
+
+def _token_cache_key(username: str, password: str) -> str:
+    """Chave do token em cache (a senha entra no hash para não reaproveitar
+    tokens com credenciais diferentes)."""
+    digest = hashlib.sha256(f"{username}\0{password}".encode()).hexdigest()
+    return f"{TOKEN_CACHE_PREFIX}{digest}"
+
+
+def _get_cached_token(cache_key: str) -> Optional[str]:
+    """Retorna o token em cache no Redis, se houver."""
+    client = getattr(celery_app.backend, "client", None)
+    if client is None:
+        return None
     try:
-        config = get_config()
-
-        # Dados para autenticação
-        auth_data = {
-            "grant_type": "password",
-            "username": username,
-            "password": password,
-            "scope": "",
-            "client_id": "string",
-            "client_secret": "********",
-        }
+        token = client.get(cache_key)
+    except Exception as e:
+        logger.warning(f"Cache de token indisponível: {e}")
+        return None
+    return token.decode() if token else None
 
-        # Headers
-        headers = {
-            "Content-Type": "application/x-www-form-urlencoded",
-            "Accept": "application/json",
-        }
 
+def _evict_cached_token(cache_key: str) -> None:
+    """Remove do Redis um token recusado pela API."""
+    client = getattr(celery_app.backend, "client", None)
+    if client is None:
+        return
+    try:
+        client.delete(cache_key)
+    except Exception as e:
+        logger.warning(f"Não foi possível remover token do cache: {e}")
+
+
+def _store_cached_token(cache_key: str, access_token: str, expires_in: int) -> None:
+    """Armazena o token no Redis até pouco antes de expirar."""
+    client = getattr(celery_app.backend, "client", None)
+    ttl = int(expires_in) - TOKEN_EXPIRY_MARGIN
+    if client is None or ttl <= 0:
+        return
+    try:
+        client.setex(cache_key, ttl, access_token)
+    except Exception as e:
+        logger.warning(f"Não foi possível armazenar token em cache: {e}")
+
+
+PRODUCTS_KEY_TEMPLATE = "servimed:task:{task_id}:products"
+PRODUCTS_TTL = 3600  # segundos
+
+
+def _store_products(task_id: str, products_json: bytes) -> Optional[str]:
+    """
+    Armazena no Redis a lista completa de produtos (JSON bruto).
+
+    Returns:
+        Chave onde os produtos ficaram disponíveis, ou None se indisponível
+    """
+    client = getattr(celery_app.backend, "client", None)
+    if client is None:
+        return None
+    key = PRODUCTS_KEY_TEMPLATE.format(task_id=task_id)
+    try:
+        # Sobrescreve: uma nova execução da mesma tarefa não deve deixar a
+        # chave apontando para os produtos da execução anterior
+        stored = client.set(key, products_json, ex=PRODUCTS_TTL)
+    except Exception as e:
+        logger.warning(f"Não foi possível armazenar produtos da tarefa: {e}")
+        return None
+    return key if stored else None
+
+
+def _load_products(products_key: str) -> bytes:
+    """Lê do Redis a lista completa de produtos (JSON bruto)."""
+    products_json = celery_app.backend.client.get(products_key)
+    if products_json is None:
+        raise ValueError(f"Produtos não encontrados em {products_key}")
+    return products_json
+
+
+def _authenticate_oauth2(username: str, password: str) -> Optional[str]:
+    """Realiza autenticação OAuth2 com a API de callback."""
+    try:
         # URL de autenticação
-        token_url = f"{config.api.base_url}{config.api.token_endpoint}"
+        token_url = _api_urls().token
 
-        logger.info(f"Fazendo requisição para: {token_url}")
+        logger.debug("Fazendo requisição para: %s", token_url)
 
         # Requisição POST
-        response = requests.post(
-            url=token_url, data=auth_data, headers=headers, timeout=30
+        response = _session.post(
+            url=token_url,
+            data=_build_auth_body(username, password),
+            headers=_AUTH_HEADERS,
+            timeout=REQUEST_TIMEOUT,
         )
 
         if response.status_code == 200:
-            auth_response = response.json()
+            auth_response = _json_loads(response.content)
             access_token = auth_response.get("access_token")
 
             if access_token:
                 logger.info("Autenticação OAuth2 realizada com sucesso")
+                _store_cached_token(
+                    _token_cache_key(username, password),
+                    access_token,
+                    auth_response.get("expires_in", 1800),
+                )
                 return access_token
             else:
                 logger.error("Token de acesso não encontrado na resposta")
@@ -73,25 +268,20 @@ def _authenticate_oauth2(username: str, password: str) -> Optional[str]:
 def _create_user_signup(username: str, password: str) -> bool:
     """Cria usuário na API de callback ."""
     try:
-        config = get_config()
-
         # Dados para signup
         signup_data = {"username": username, "password": password}
 
-        # Headers
-        headers = {
-            "Content-Type": "application/json",
-            "Accept": "application/json",
-        }
-
         # URL de signup
-        signup_url = f"{config.api.base_url}{config.api.signup_endpoint}"
+        signup_url = _api_urls().signup
 
-        logger.info(f"Tentando criar usuário em: {signup_url}")
+        logger.debug("Tentando criar usuário em: %s", signup_url)
 
         # Requisição POST
-        response = requests.post(
-            url=signup_url, json=signup_data, headers=headers, timeout=30
+        response = _session.post(
+            url=signup_url,
+            data=_json_dumps_bytes(signup_data),
+            headers=_JSON_HEADERS,
+            timeout=REQUEST_TIMEOUT,
         )
 
         # Se usuário criado OU já existe, considerar sucesso
@@ -109,86 +299,199 @@ def _create_user_signup(username: str, password: str) -> bool:
         return False
 
 
-def _extract_products(auth_token: str) -> list:
-    """Extrai produtos da API usando o token de autenticação."""
-    try:
-        config = get_config()
+def _get_token(username: str, password: str) -> Optional[str]:
+    """
+    Obtém um token OAuth2, reutilizando o do cache enquanto for válido.
+
+    Signup e autenticação só são feitos quando não há token em cache.
+    """
+    cached_token = _get_cached_token(_token_cache_key(username, password))
+    if cached_token:
+        logger.info("Token OAuth2 reutilizado do cache")
+        return cached_token
+
+    # 1. Criar usuário na API (signup)
+    logger.debug("Tentando criar usuário na API...")
+    signup_success = _create_user_signup(username=username, password=password)
+
+    if not signup_success:
+        logger.warning("Signup não concluído, mas continuando com autenticação...")
+
+    # 2. Autenticação OAuth2
+    logger.debug("Realizando autenticação OAuth2...")
+    return _authenticate_oauth2(username=username, password=password)
+
+
+class _TokenRejected(Exception):
+    """Token OAuth2 recusado pela API de produtos (HTTP 401)."""
+
+
+def _extract_products(auth_token: str) -> Tuple[list, bytes]:
+    """
+    Extrai produtos da API usando o token de autenticação.
 
+    Returns:
+        Lista de produtos e o corpo JSON bruto da resposta
+    """
+    try:
         # Headers com autorização
-        headers = {
-            "Accept": "application/json",
-            "Authorization": f"Bearer {auth_token}",
-        }
+        headers = dict(_ACCEPT_JSON_HEADERS, Authorization=f"Bearer {auth_token}")
 
         # URL de produtos
-        products_url = f"{config.api.base_url}{config.api.products_endpoint}"
+        products_url = _api_urls().products
 
-        logger.info(f"Fazendo requisição para: {products_url}")
+        logger.debug("Fazendo requisição para: %s", products_url)
 
         # Requisição GET
-        response = requests.get(url=products_url, headers=headers, timeout=30)
+        response = _session.get(
+            url=products_url, headers=headers, timeout=REQUEST_TIMEOUT
+        )
 
         if response.status_code == 200:
-            products = response.json()
+            products = _json_loads(response.content)
 
             if isinstance(products, list):
                 logger.info(f"Produtos extraídos: {len(products)}")
-                return products
+                return products, response.content
             else:
                 logger.error("Resposta não é uma lista de produtos")
-                return []
+                return [], b""
+        elif response.status_code == 401:
+            logger.warning("Token OAuth2 recusado pela API de produtos")
+            raise _TokenRejected("Token OAuth2 recusado (HTTP 401)")
         else:
             logger.error(f"Erro na API de produtos: Status {response.status_code}")
             logger.error(f"Resposta: {response.text}")
-            return []
+            return [], b""
 
+    except _TokenRejected:
+        raise
     except Exception as e:
         logger.error(f"Erro durante extração de produtos: {e}")
-        return []
+        return [], b""
+
+
+def _build_callback_payload(products_json: bytes, total_count: int) -> bytes:
+    """Monta o payload do callback reaproveitando o JSON bruto dos produtos."""
+    return b"".join(
+        (
+            b'{"products":',
+            products_json,
+            b',"extracted_at":"',
+            datetime.now().isoformat().encode(),
+            b'","total_count":',
+            str(total_count).encode(),
+            b"}",
+        )
+    )
+
+
+def _post_callback(
+    callback_url: str, payload: bytes, headers: Dict[str, str]
+) -> Dict[str, Any]:
+    """Faz o POST de um payload JSON para o callback e resume a resposta."""
+    if get_config().api.callback_gzip:
+        # Nível 1: a maior parte da redução com custo mínimo de CPU
+        payload = gzip.compress(payload, compresslevel=1)
+        headers = {**headers, "Content-Encoding": "gzip"}
+
+    response = _session.post(
+        url=callback_url, data=payload, headers=headers, timeout=CALLBACK_TIMEOUT
+    )
+
+    if response.status_code in [200, 201]:
+        return {
+            "status": "success",
+            "status_code": response.status_code,
+            "response": _json_loads(response.content) if response.content else None,
+        }
+    else:
+        logger.warning(
+            f"Resposta inesperada do callback: Status {response.status_code}"
+        )
+        return {
+            "status": "warning",
+            "status_code": response.status_code,
+            "response": response.text,
+        }
 
 
 def _send_to_callback(
-    callback_url: str, products: list, auth_token: str
+    callback_url: str, products_json: bytes, total_count: int, auth_token: str
 ) -> Dict[str, Any]:
     """Envia produtos extraídos para a API de callback."""
     try:
         # Headers com autorização
-        headers = {
-            "Content-Type": "application/json",
-            "Accept": "application/json",
-            "Authorization": f"Bearer {auth_token}",
-        }
+        headers = dict(_JSON_HEADERS, Authorization=f"Bearer {auth_token}")
 
-        # Dados para enviar
-        payload = {
-            "products": products,
-            "extracted_at": datetime.now().isoformat(),
-            "total_count": len(products),
-        }
+        # Dados para enviar (sem decodificar/recodificar os produtos)
+        payload = _build_callback_payload(products_json, total_count)
 
-        logger.info(f"Enviando {len(products)} produtos para: {callback_url}")
+        logger.info(f"Enviando {total_count} produtos para: {callback_url}")
 
         # Requisição POST
-        response = requests.post(
-            url=callback_url, json=payload, headers=headers, timeout=60
+        result = _post_callback(callback_url, payload, headers)
+        if result["status"] == "success":
+            logger.info("Dados enviados para callback com sucesso")
+        return result
+
+    except Exception as e:
+        logger.error(f"Erro ao enviar para callback: {e}")
+        return {"status": "error", "error": str(e)}
+
+
+def _send_chunks_to_callback(
+    callback_url: str, products: list, auth_token: str, chunk_size: int
+) -> Dict[str, Any]:
+    """
+    Envia os produtos para a API de callback em partes de `chunk_size`.
+
+    Cada POST carrega `chunk_index` e `total_chunks`; até
+    MAX_CALLBACK_WORKERS partes são enviadas em paralelo.
+    """
+    try:
+        # Headers com autorização
+        headers = dict(_JSON_HEADERS, Authorization=f"Bearer {auth_token}")
+
+        total_count = len(products)
+        total_chunks = math.ceil(total_count / chunk_size)
+        extracted_at = datetime.now().isoformat()
+
+        logger.info(
+            f"Enviando {total_count} produtos em {total_chunks} partes para: "
+            f"{callback_url}"
         )
 
-        if response.status_code in [200, 201]:
-            logger.info("Dados enviados para callback com sucesso")
-            return {
-                "status": "success",
-                "status_code": response.status_code,
-                "response": response.json() if response.content else None,
-            }
-        else:
-            logger.warning(
-                f"Resposta inesperada do callback: Status {response.status_code}"
+        def post_chunk(chunk_index: int) -> Dict[str, Any]:
+            start = chunk_index * chunk_size
+            payload = _json_dumps_bytes(
+                {
+                    "products": products[start : start + chunk_size],
+                    "chunk_index": chunk_index,
+                    "total_chunks": total_chunks,
+                    "extracted_at": extracted_at,
+                    "total_count": total_count,
+                }
             )
-            return {
-                "status": "warning",
-                "status_code": response.status_code,
-                "response": response.text,
-            }
+            return _post_callback(callback_url, payload, headers)
+
+        # Partes independentes: sobrepor a latência dos POSTs
+        workers = min(MAX_CALLBACK_WORKERS, total_chunks)
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            results = list(executor.map(post_chunk, range(total_chunks)))
+
+        chunks_sent = sum(result["status"] == "success" for result in results)
+        for result in results:
+            if result["status"] != "success":
+                return dict(result, chunks_sent=chunks_sent)
+
+        logger.info("Dados enviados para callback com sucesso")
+        return {
+            "status": "success",
+            "status_code": results[-1]["status_code"],
+            "response": [result["response"] for result in results],
+            "chunks_sent": chunks_sent,
+        }
 
     except Exception as e:
         logger.error(f"Erro ao enviar para callback: {e}")
@@ -200,74 +503,168 @@ def execute_scraping(self, task_data: Dict[str, Any]) -> Dict[str, Any]:
     """
     Tarefa principal para executar scraping de produtos.
 
+    Substitui a si mesma por uma cadeia de etapas (autenticação ->
+    extração -> callback), liberando o worker entre as esperas de rede.
+    O resultado final fica registrado no ID desta tarefa.
+
     Args:
         task_data: Dados da tarefa (usuário, senha, callback_url)
 
     Returns:
         Dict com resultado da execução
     """
-    task_id = self.request.id
-    start_time = time.time()
+    logger.info(f"Iniciando tarefa de scraping: {self.request.id}")
 
+    # Validar os dados antes de qualquer requisição HTTP
+    try:
+        task_data = ScrapingTaskRequest.model_validate(task_data).model_dump()
+    except ValidationError as e:
+        raise _scraping_error(e)
+
+    pipeline = chain(
+        authenticate_scraping.s(task_data, time.time()),
+        extract_scraping_products.s(task_data, self.request.id),
+        send_scraping_callback.s(task_data["callback_url"]),
+    )
+    return self.replace(pipeline)
+
+
+def _scraping_error(e: Exception) -> ValueError:
+    """Registra e padroniza o erro de uma etapa do scraping."""
+    error_msg = f"Erro na tarefa de scraping: {str(e)}"
+    logger.error(error_msg)
+    return ValueError(error_msg)
+
+
+# Etapas intermediárias repassam o retorno direto à próxima etapa; não há
+# motivo para gravá-lo no backend (o token ficaria lá por result_expires).
+# Erros continuam gravados: é assim que o FAILURE chega ao ID consultado
+@celery_app.task(
+    name="servimed.scraping_tasks.authenticate_scraping",
+    ignore_result=True,
+    store_errors_even_if_ignored=True,
+)
+def authenticate_scraping(
+    task_data: Dict[str, Any], start_time: float
+) -> Dict[str, Any]:
+    """Etapa 1: signup e autenticação OAuth2 (ou token em cache)."""
     try:
-        logger.info(f"Iniciando tarefa de scraping: {task_id}")
+        auth_token = _get_token(task_data["usuario"], task_data["senha"])
 
-        # 1. Criar usuário na API (signup)
-        logger.info("Tentando criar usuário na API...")
-        signup_success = _create_user_signup(
-            username=task_data["usuario"], password=task_data["senha"]
-        )
+        if not auth_token:
+            raise ValueError("Falha na autenticação OAuth2")
 
-        if not signup_success:
-            logger.warning("Signup não concluído, mas continuando com autenticação...")
+        return {"auth_token": auth_token, "start_time": start_time}
 
-        # 2. Autenticação OAuth2
-        logger.info("Realizando autenticação OAuth2...")
-        auth_token = _authenticate_oauth2(
-            username=task_data["usuario"], password=task_data["senha"]
-        )
+    except Exception as e:
+        raise _scraping_error(e)
 
-        if not auth_token:
-            raise ValueError("Falha na autenticação OAuth2")
 
+@celery_app.task(
+    name="servimed.scraping_tasks.extract_scraping_products",
+    ignore_result=True,
+    store_errors_even_if_ignored=True,
+)
+def extract_scraping_products(
+    stage: Dict[str, Any], task_data: Dict[str, Any], task_id: str
+) -> Dict[str, Any]:
+    """Etapa 2: extração dos produtos (gravados no Redis; segue só a chave)."""
+    try:
         # 3. Extrair produtos
         logger.info("Extraindo produtos da API...")
-        products = _extract_products(auth_token)
+        try:
+            products, products_json = _extract_products(stage["auth_token"])
+        except _TokenRejected:
+            # Token em cache invalidado antes do previsto: renovar uma vez
+            username, password = task_data["usuario"], task_data["senha"]
+            _evict_cached_token(_token_cache_key(username, password))
+            auth_token = _get_token(username, password)
+            if not auth_token:
+                raise ValueError("Falha na autenticação OAuth2")
+            stage = dict(stage, auth_token=auth_token)
+            products, products_json = _extract_products(auth_token)
 
         if not products:
             raise ValueError("Nenhum produto extraído")
 
-        # 4. Enviar para API de callback
-        logger.info("Enviando dados para API de callback...")
-        callback_response = _send_to_callback(
-            callback_url=task_data["callback_url"],
-            products=products,
-            auth_token=auth_token,
+        stage = dict(
+            stage,
+            products_sample=products[:RESULT_SAMPLE_SIZE],
+            total_count=len(products),
         )
 
+        # Cópia única da lista completa, lida pela etapa de callback; sem
+        # Redis disponível o JSON bruto segue junto na própria cadeia
+        products_key = _store_products(task_id, products_json)
+        if products_key:
+            stage["products_key"] = products_key
+        else:
+            stage["products_json"] = products_json
+        return stage
+
+    except Exception as e:
+        raise _scraping_error(e)
+
+
+@celery_app.task(bind=True, name="servimed.scraping_tasks.send_scraping_callback")
+def send_scraping_callback(
+    self, stage: Dict[str, Any], callback_url: str
+) -> Dict[str, Any]:
+    """Etapa 3: envio para a API de callback e montagem do resultado."""
+    task_id = self.request.id
+
+    try:
+        total_count = stage["total_count"]
+        products_key = stage.get("products_key")
+        if products_key:
+            products_json = _load_products(products_key)
+        else:
+            products_json = stage["products_json"]
+        chunk_size = get_config().api.callback_chunk_size
+
+        # 4. Enviar para API de callback (em partes, se configurado)
+        logger.info("Enviando dados para API de callback...")
+        if 0 < chunk_size < total_count:
+            callback_response = _send_chunks_to_callback(
+                callback_url=callback_url,
+                products=_json_loads(products_json),
+                auth_token=stage["auth_token"],
+                chunk_size=chunk_size,
+            )
+        else:
+            callback_response = _send_to_callback(
+                callback_url=callback_url,
+                products_json=products_json,
+                total_count=total_count,
+                auth_token=stage["auth_token"],
+            )
+
         # Calcular tempo total
-        extraction_time = time.time() - start_time
+        extraction_time = time.time() - stage["start_time"]
 
-        # 4. Criar resultado
+        # 5. Criar resultado (apenas uma amostra dos produtos vai para o
+        # backend do Celery; a lista completa fica em uma chave própria)
         result = ScrapingResult(
             task_id=task_id,
-            total_products=len(products),
-            products=products,
+            total_products=total_count,
+            products=stage["products_sample"],
+            products_key=products_key,
             extraction_time=extraction_time,
             callback_sent=True,
             callback_response=callback_response,
         )
 
-        logger.info(f"Tarefa concluída com sucesso: {task_id}")
-        logger.info(f"Total de produtos: {len(products)}")
-        logger.info(f"Tempo de execução: {extraction_time:.2f}s")
+        logger.info(
+            "Tarefa concluída com sucesso: %s (%d produtos em %.2fs)",
+            task_id,
+            total_count,
+            extraction_time,
+        )
 
-        return result.dict()
+        return result.model_dump()
 
     except Exception as e:
-        error_msg = f"Erro na tarefa de scraping: {str(e)}"
-        logger.error(error_msg)
-        raise ValueError(error_msg)
+        raise _scraping_error(e)
 
 
 @celery_app.task(name="servimed.scraping_tasks.test_task")
@@ -24,6 +24,12 @@ from servimed.models.scraping_task import (
 )
 
 
+@pytest.fixture(scope="module")
+def now():
+    """Instante único reutilizado pelos testes do módulo."""
+    return datetime.now()
+
+
 class TestScrapingTaskRequest:
     """Testes para o modelo ScrapingTaskRequest."""
     
@@ -75,8 +81,8 @@ class TestScrapingTaskRequest:
         )
         
         # Verificar se o schema está configurado
-        assert hasattr(request.Config, 'schema_extra')
-        assert 'example' in request.Config.schema_extra
+        assert 'json_schema_extra' in request.model_config
+        assert 'example' in request.model_config['json_schema_extra']
 
 
 class TestScrapingTaskResponse:
@@ -134,21 +140,21 @@ class TestScrapingTaskResponse:
         )
         
         # Verificar se o schema está configurado
-        assert hasattr(response.Config, 'schema_extra')
-        assert 'example' in response.Config.schema_extra
+        assert 'json_schema_extra' in response.model_config
+        assert 'example' in response.model_config['json_schema_extra']
 
 
 class TestScrapingTaskStatus:
     """Testes para o modelo ScrapingTaskStatus."""
     
-    def test_scraping_task_status_creation_valid(self):
+    def test_scraping_task_status_creation_valid(self, now):
         """Testa criação de ScrapingTaskStatus com dados válidos."""
         status = ScrapingTaskStatus(
             task_id="uuid-1234",
             status="pending",
             progress=0.0,
             message="Tarefa aguardando processamento",
-            created_at=datetime.now(),
+            created_at=now,
             started_at=None,
             completed_at=None,
             error=None,
@@ -165,58 +171,37 @@ class TestScrapingTaskStatus:
         assert status.error is None
         assert status.result is None
     
-    def test_scraping_task_status_progress_validation(self):
+    @pytest.mark.parametrize(
+        "progress,valid", [(0.5, True), (-0.1, False), (1.1, False)]
+    )
+    def test_scraping_task_status_progress_validation(self, now, progress, valid):
         """Testa validação de progresso entre 0.0 e 1.0."""
-        # Progresso válido
-        status = ScrapingTaskStatus(
+        dados = dict(
             task_id="uuid-1234",
             status="processing",
-            progress=0.5,
+            progress=progress,
             message="Processando...",
-            created_at=datetime.now(),
+            created_at=now,
             started_at=None,
             completed_at=None,
             error=None,
             result=None
         )
-        assert status.progress == 0.5
         
-        # Progresso inválido - menor que 0.0
-        with pytest.raises(ValueError, match="Progresso deve estar entre 0.0 e 1.0"):
-            ScrapingTaskStatus(
-                task_id="uuid-1234",
-                status="processing",
-                progress=-0.1,
-                message="Processando...",
-                created_at=datetime.now(),
-                started_at=None,
-                completed_at=None,
-                error=None,
-                result=None
-            )
-        
-        # Progresso inválido - maior que 1.0
-        with pytest.raises(ValueError, match="Progresso deve estar entre 0.0 e 1.0"):
-            ScrapingTaskStatus(
-                task_id="uuid-1234",
-                status="processing",
-                progress=1.1,
-                message="Processando...",
-                created_at=datetime.now(),
-                started_at=None,
-                completed_at=None,
-                error=None,
-                result=None
-            )
+        if valid:
+            assert ScrapingTaskStatus(**dados).progress == progress
+        else:
+            with pytest.raises(ValueError, match="Progresso deve estar entre 0.0 e 1.0"):
+                ScrapingTaskStatus(**dados)
     
-    def test_scraping_task_status_example_schema(self):
+    def test_scraping_task_status_example_schema(self, now):
         """Testa se o schema de exemplo está correto."""
         status = ScrapingTaskStatus(
             task_id="uuid-1234",
             status="pending",
             progress=0.0,
             message="Tarefa criada com sucesso",
-            created_at=datetime.now(),
+            created_at=now,
             started_at=None,
             completed_at=None,
             error=None,
@@ -224,8 +209,8 @@ class TestScrapingTaskStatus:
         )
         
         # Verificar se o schema está configurado
-        assert hasattr(status.Config, 'schema_extra')
-        assert 'example' in status.Config.schema_extra
+        assert 'json_schema_extra' in status.model_config
+        assert 'example' in status.model_config['json_schema_extra']
 
 
 class TestIntegration:
@@ -27,6 +27,12 @@ from servimed.models.order import (
 )
 
 
+@pytest.fixture(scope="module")
+def now():
+    """Instante único reutilizado pelos testes do módulo."""
+    return datetime.now()
+
+
 class TestProductItem:
     """Testes para o modelo ProductItem."""
     
@@ -69,8 +75,8 @@ class TestProductItem:
         )
         
         # Verificar se o schema está configurado
-        assert hasattr(product.Config, 'schema_extra')
-        assert 'example' in product.Config.schema_extra
+        assert 'json_schema_extra' in product.model_config
+        assert 'example' in product.model_config['json_schema_extra']
 
 
 class TestOrderRequest:
@@ -123,8 +129,8 @@ class TestOrderRequest:
         )
         
         # Verificar se o schema está configurado
-        assert hasattr(order.Config, 'schema_extra')
-        assert 'example' in order.Config.schema_extra
+        assert 'json_schema_extra' in order.model_config
+        assert 'example' in order.model_config['json_schema_extra']
 
 
 class TestOrderResponse:
@@ -148,8 +154,8 @@ class TestOrderResponse:
         )
         
         # Verificar se o schema está configurado
-        assert hasattr(response.Config, 'schema_extra')
-        assert 'example' in response.Config.schema_extra
+        assert 'json_schema_extra' in response.model_config
+        assert 'example' in response.model_config['json_schema_extra']
 
 
 class TestOrder:
@@ -188,21 +194,21 @@ class TestOrder:
         )
         
         # Verificar se o schema está configurado
-        assert hasattr(order.Config, 'schema_extra')
-        assert 'example' in order.Config.schema_extra
+        assert 'json_schema_extra' in order.model_config
+        assert 'example' in order.model_config['json_schema_extra']
 
 
 class TestOrderStatus:
     """Testes para o modelo OrderStatus."""
     
-    def test_order_status_creation_valid(self):
+    def test_order_status_creation_valid(self, now):
         """Testa criação de OrderStatus com dados válidos."""
         status = OrderStatus(
             task_id="uuid-1234",
             status="pending",
             progress=0.0,
             message="Tarefa criada com sucesso",
-            created_at=datetime.now(),
+            created_at=now,
             started_at=None,
             completed_at=None,
             error=None,
@@ -219,58 +225,37 @@ class TestOrderStatus:
         assert status.error is None
         assert status.result is None
     
-    def test_order_status_progress_validation(self):
+    @pytest.mark.parametrize(
+        "progress,valid", [(0.5, True), (-0.1, False), (1.1, False)]
+    )
+    def test_order_status_progress_validation(self, now, progress, valid):
         """Testa validação de progresso entre 0.0 e 1.0."""
-        # Progresso válido
-        status = OrderStatus(
+        dados = dict(
             task_id="uuid-1234",
             status="processing",
-            progress=0.5,
+            progress=progress,
             message="Processando...",
-            created_at=datetime.now(),
+            created_at=now,
             started_at=None,
             completed_at=None,
             error=None,
             result=None
         )
-        assert status.progress == 0.5
         
-        # Progresso inválido - menor que 0.0
-        with pytest.raises(ValueError, match="Progresso deve estar entre 0.0 e 1.0"):
-            OrderStatus(
-                task_id="uuid-1234",
-                status="processing",
-                progress=-0.1,
-                message="Processando...",
-                created_at=datetime.now(),
-                started_at=None,
-                completed_at=None,
-                error=None,
-                result=None
-            )
-        
-        # Progresso inválido - maior que 1.0
-        with pytest.raises(ValueError, match="Progresso deve estar entre 0.0 e 1.0"):
-            OrderStatus(
-                task_id="uuid-1234",
-                status="processing",
-                progress=1.1,
-                message="Processando...",
-                created_at=datetime.now(),
-                started_at=None,
-                completed_at=None,
-                error=None,
-                result=None
-            )
+        if valid:
+            assert OrderStatus(**dados).progress == progress
+        else:
+            with pytest.raises(ValueError, match="Progresso deve estar entre 0.0 e 1.0"):
+                OrderStatus(**dados)
     
-    def test_order_status_example_schema(self):
+    def test_order_status_example_schema(self, now):
         """Testa se o schema de exemplo está correto."""
         status = OrderStatus(
             task_id="uuid-1234",
             status="pending",
             progress=0.0,
             message="Tarefa criada com sucesso",
-            created_at=datetime.now(),
+            created_at=now,
             started_at=None,
             completed_at=None,
             error=None,
@@ -278,8 +263,8 @@ class TestOrderStatus:
         )
         
         # Verificar se o schema está configurado
-        assert hasattr(status.Config, 'schema_extra')
-        assert 'example' in status.Config.schema_extra
+        assert 'json_schema_extra' in status.model_config
+        assert 'example' in status.model_config['json_schema_extra']
 
 
 class TestIntegration:
@@ -326,7 +311,7 @@ class TestIntegration:
             started_at=datetime.now(),
             completed_at=datetime.now(),
             error=None,
-            result=order_response.dict()
+            result=order_response.model_dump()
         )
         
         # Verificações de integração
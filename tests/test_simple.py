@@ -5,43 +5,38 @@ Teste simples para demonstrar que o sistema de testes está funcionando.
 import pytest
 from servimed.models.order import ProductItem
 
+# Avisos de depreciação do pydantic (API v1) falham os testes deste módulo
+pytestmark = pytest.mark.filterwarnings(
+    "error::pydantic.warnings.PydanticDeprecatedSince20"
+)
 
-def test_simple_product_creation():
+
+@pytest.fixture(scope="module")
+def valid_product():
+    """Produto válido construído uma única vez para o módulo."""
+    return ProductItem(gtin="7899095203136", codigo="446231", quantidade=1)
+
+
+def test_simple_product_creation(valid_product):
     """Teste simples de criação de produto."""
-    product = ProductItem(
-        gtin="7899095203136",
-        codigo="446231",
-        quantidade=1
-    )
-    
-    assert product.gtin == "7899095203136"
-    assert product.codigo == "446231"
-    assert product.quantidade == 1
-    print("✅ Teste simples passou!")
-
-
-def test_product_validation():
-    """Teste de validação de produto."""
-    # Teste válido
-    product = ProductItem(
-        gtin="7899095203136",
-        codigo="446231",
-        quantidade=5
-    )
-    assert product.quantidade == 5
-    
-    # Teste de quantidade inválida
-    with pytest.raises(ValueError):
-        ProductItem(
-            gtin="7899095203136",
-            codigo="446231",
-            quantidade=0  # Inválido
-        )
-    print("✅ Teste de validação passou!")
-
-
-if __name__ == "__main__":
-    # Executar testes
-    test_simple_product_creation()
-    test_product_validation()
-    print("\n🎉 Todos os testes passaram!")
+    assert valid_product.gtin == "7899095203136"
+    assert valid_product.codigo == "446231"
+    assert valid_product.quantidade == 1
+
+
+@pytest.mark.parametrize(
+    "quantidade",
+    [pytest.param(1, id="ok1"), pytest.param(5, id="ok5")],
+)
+def test_product_quantidade_valida(quantidade):
+    """Quantidades a partir de 1 são aceitas."""
+    product = ProductItem(gtin="7899095203136", codigo="446231", quantidade=quantidade)
+
+    assert product.quantidade == quantidade
+
+
+@pytest.mark.parametrize("quantidade", [pytest.param(0, id="bad0")])
+def test_product_quantidade_invalida(quantidade):
+    """Quantidade abaixo de 1 é rejeitada apontando o campo."""
+    with pytest.raises(ValueError, match="quantidade"):
+        ProductItem(gtin="7899095203136", codigo="446231", quantidade=quantidade)